@@ -1,7 +1,8 @@
 import os, sys
 from buildDB import addToLocal, check_ldb, check_fmt, check_date
 import argparse
-from astroquery.simbad import Simbad
+from queryOnline import simbadIDsMulti
+from queryCache import QueryCache
 from pathlib import Path
 import shutil
 
@@ -50,14 +51,18 @@ parser.add_argument("--bna",dest='Bna',default='',type=str,
                     help='Waveband name or list of waveband names.')
 parser.add_argument("--ldb",dest='ldb',default='',type=str,
                     help='')
+parser.add_argument("--cache-dir",dest="cacheDir",default='',type=str,
+                    help='Directory for the SIMBAD query cache (default ~/.cache/sedbys)')
+parser.add_argument("--no-cache",dest="noCache",action='store_true',
+                    help='Always query SIMBAD directly, without reading or saving cached responses')
 
 argopt = parser.parse_args()
 
 # 1. Has SEDBYS been correctly set up on the local machine?
-localDB_trunk = check_ldb(Path(argopt.ldb))
+localDB_trunk = check_ldb(Path(argopt.ldb), minInterval=0) # always update before editing
 
 ######
-# Re-format the parsed values in preparation to build the python dictionary:
+# Re-format the parsed values in preparation to build the catalog entry:
 ######
 print('Locating file '+str(Path(argopt.fil))+'...')
 if not Path(argopt.fil).exists():
@@ -91,30 +96,20 @@ else:
 
 print('   Passed: check complete.')
 
-dID = "'"+argopt.nam+"' : "# label for the python dictionary (make it end in ' : ')
-oP = "localDB / 'database' / '"+file.name+"'" # path to local file
-oR = "'"+argopt.ref+"'"   # reference 
-if '[' not in argopt.wav:
-    oW = '['+argopt.wav+']' # wavelength or list of wavelengths
-else:
-    oW = argopt.wav
-if '[' not in argopt.res:
-    oA = '['+argopt.res+']' # ang res / beam size
-else:
-    oA = argopt.res
-
-fluxN = [b.strip().replace('[', '').replace(']', '') for b in argopt.Fna.split(',')]
-oM = "['"+"','".join(fluxN)+"']" # column name for flux/mag
-
-fluxE = [b.strip().replace('[', '').replace(']', '') for b in argopt.Ena.split(',')]
-oE = "['"+"','".join(fluxE)+"']" # column name for error on flux/mag
-
-fluxU = [b.strip().replace('[', '').replace(']', '') for b in argopt.Una.split(',')]
-oU = "['"+"','".join(fluxU)+"']" # units or list of units for flux/mag
-
-fluxB = [b.strip().replace('[', '').replace(']', '') for b in argopt.Bna.split(',')]
-oB = "['"+"','".join(fluxB)+"']" # waveband name to match with zeropoints table
+# wavelength (or list of wavelengths) and angular resolution / beam size:
+try:
+    waves = [float(w) for w in argopt.wav.replace('[', '').replace(']', '').split(',')]
+    beams = [float(a) for a in argopt.res.replace('[', '').replace(']', '').split(',')]
+except ValueError:
+    print('')
+    print('Error: wavelengths and angular resolutions must be numbers!')
+    print('')
+    sys.exit()
 
+fluxN = [b.strip().replace('[', '').replace(']', '') for b in argopt.Fna.split(',')] # column names for flux/mag
+fluxE = [b.strip().replace('[', '').replace(']', '') for b in argopt.Ena.split(',')] # column names for error on flux/mag
+fluxU = [b.strip().replace('[', '').replace(']', '') for b in argopt.Una.split(',')] # units for flux/mag
+fluxB = [b.strip().replace('[', '').replace(']', '') for b in argopt.Bna.split(',')] # waveband names to match with zeropoints table
 
 ######
 # Formatting and database checks:
@@ -152,41 +147,49 @@ if not all(len(l) == th_len for l in it1):
     print('Error: lines in file have different lengths!')
     endhere = True
 
-# e) Each target name should be as-in SIMBAD (or as in SIMBAD plus a binary identifier):
-for f in fc:
-    try:
-        objID = Simbad.query_objectids(f.split(',')[0])
-    except TimeoutError:
-        print('')
-        print('Connection Error: please ensure you are connected to the internet')
-        print('and try again.')
-        print('')
-    if not objID:
+# e) Each target name should be as-in SIMBAD (or as in SIMBAD plus a binary identifier).
+#    All names are resolved in one batched SIMBAD query (re-using any cached names), 
+#    followed by a second batch for the parent names of any not recognised:
+cache = None if argopt.noCache else QueryCache(argopt.cacheDir)
+targets = [f.split(',')[0] for f in fc]
+parents = {t : ' '.join(t.split(' ')[:-1]) for t in targets}
+try:
+    objIDs = simbadIDsMulti(targets, cache)
+    objIDs.update(simbadIDsMulti([parents[t] for t in targets 
+                                  if not objIDs[t] and parents[t] != ''], cache))
+except OSError:
+    print('')
+    print('Connection Error: please ensure you are connected to the internet')
+    print('and try again.')
+    print('')
+    sys.exit()
+
+for t in targets:
+    if not objIDs[t]:
         print('')
-        print('Warning: object name '+f.split(',')[0]+' not recognised by SIMBAD!')
+        print('Warning: object name '+t+' not recognised by SIMBAD!')
         # Try treat it as photometry of binary component (expect e.g. A or A+B label)
-        print(' - blindly assuming multiplicity: check '+' '.join(f.split(',')[0].split(' ')[:-1]))
-        try:
-            obj = [a[0] for a in Simbad.query_objectids(' '.join(f.split(',')[0].split(' ')[:-1]))]
-            print(' - '+' '.join(f.split(',')[0].split(' ')[:-1])+' recognised by SIMBAD')
-            if ' '.join(f.split(',')[0].split(' ')[:-1]) not in [' '.join(o.split()) for o in obj]:
+        print(' - blindly assuming multiplicity: check '+parents[t])
+        obj = objIDs.get(parents[t], [])
+        if obj:
+            print(' - '+parents[t]+' recognised by SIMBAD')
+            if parents[t] not in [' '.join(o.split()) for o in obj]:
                 print(' but object name appears differently in SIMBAD!')
                 for o in obj:
-                    if ' '.join(f.split(',')[0].split(' ')[:-1]) in ' '.join(o.split()):
+                    if parents[t] in ' '.join(o.split()):
                         o1 = ' '.join(o.split())
-                        print('Suggestion: use '+o1+' '+f.split(',')[0].split(' ')[-1]+' instead.')
+                        print('Suggestion: use '+o1+' '+t.split(' ')[-1]+' instead.')
                 endhere = True
             else:
                 print(' and we are fine to continue...')
-        except TypeError:
+        else:
             print('Error: not multiple. Object name not registered in SIMBAD!')
             endhere = True
     else:
-        objIDs = [a[0] for a in Simbad.query_objectids(f.split(',')[0])]
-        if f.split(',')[0] not in [' '.join(o.split()) for o in objIDs]:
-            print('Error: object name '+f.split(',')[0]+' appears differently in SIMBAD!')
-            for o in objIDs:
-                if f.split(',')[0] in ' '.join(o.split()):
+        if t not in [' '.join(o.split()) for o in objIDs[t]]:
+            print('Error: object name '+t+' appears differently in SIMBAD!')
+            for o in objIDs[t]:
+                if t in ' '.join(o.split()):
                     o1 = ' '.join(o.split())
                     print(' - Suggestion: use '+o1+' instead.')
             endhere = True
@@ -242,7 +245,7 @@ check_fmt(argopt.ref, argopt.nam, localDB_trunk, fluxU, fluxB)
 # 4. Are the lists of flux, error, units and resolution the same length?
 print('')
 print('Ensuring parsed lists have same length...')
-lists = [oW.split(','), oA.split(','), oM.split(','), oE.split(','), oU.split(','), oB.split(',')]
+lists = [waves, beams, fluxN, fluxE, fluxU, fluxB]
 it = iter(lists)
 the_len = len(next(it))
 if not all(len(l) == the_len for l in it):
@@ -256,6 +259,8 @@ else:
 ######
 # Finish:
 ######
-# 1. make changes to cat_setup.py
-outlist = [dID+oP, dID+oR, dID+oW, dID+oA, dID+oM, dID+oE, dID+oU, dID+oB]
-addToLocal(outlist, localDB_trunk)
+# 1. add the new table to catalogs.json
+record = {'file' : (Path('database') / file.name).as_posix(), 'ref' : argopt.ref,
+          'wav' : waves, 'res' : beams, 'flux' : fluxN, 'err' : fluxE, 
+          'unit' : fluxU, 'band' : fluxB}
+addToLocal(argopt.nam, record, localDB_trunk)
@@ -1,5 +1,5 @@
 from buildDB import addToCat, check_ldb, check_fmt
-from cat_setup import src_localDB, src_onlineDB
+from catalogs import get_catalogs, catalogs_file
 from astroquery.vizier import Vizier
 import sys, os
 import argparse
@@ -47,38 +47,28 @@ parser.add_argument("--ldb",dest='ldb',default='',type=str,
 argopt = parser.parse_args()
 
 ######
-# Re-format the parsed values in preparation to build the python dictionary:
+# Re-format the parsed values in preparation to build the catalog entry:
 ######
-dID = "'"+argopt.nam+"' : " # unique catalog identifier for dict (make it end in ' : ')
-oP = "'"+argopt.cat+"'"     # VizieR catalog reference code
-oR = "'"+argopt.ref+"'"     # reference 
-if '[' not in argopt.wav:
-    oW = '['+argopt.wav+']' # wavelength or list of wavelengths
-else:
-    oW = argopt.wav
-if '[' not in argopt.res:
-    oA = '['+argopt.res+']' # ang res / beam size
-else:
-    oA = argopt.res
-
-fluxN = [b.strip().replace('[', '').replace(']', '') for b in argopt.Fna.split(',')]
-oM = "['"+"','".join(fluxN)+"']" # column name for flux/mag
-
-fluxE = [b.strip().replace('[', '').replace(']', '') for b in argopt.Ena.split(',')]
-oE = "['"+"','".join(fluxE)+"']" # column name for error on flux/mag
-
-fluxU = [b.strip().replace('[', '').replace(']', '') for b in argopt.Una.split(',')]
-oU = "['"+"','".join(fluxU)+"']" # units or list of units for flux/mag
-
-fluxB = [b.strip().replace('[', '').replace(']', '') for b in argopt.Bna.split(',')]
-oB = "['"+"','".join(fluxB)+"']" # waveband name to match with zeropoints table
+# wavelength (or list of wavelengths) and angular resolution / beam size:
+try:
+    waves = [float(w) for w in argopt.wav.replace('[', '').replace(']', '').split(',')]
+    beams = [float(a) for a in argopt.res.replace('[', '').replace(']', '').split(',')]
+except ValueError:
+    print('')
+    print('Error: wavelengths and angular resolutions must be numbers!')
+    print('')
+    sys.exit()
 
+fluxN = [b.strip().replace('[', '').replace(']', '') for b in argopt.Fna.split(',')] # column names for flux/mag
+fluxE = [b.strip().replace('[', '').replace(']', '') for b in argopt.Ena.split(',')] # column names for error on flux/mag
+fluxU = [b.strip().replace('[', '').replace(']', '') for b in argopt.Una.split(',')] # units for flux/mag
+fluxB = [b.strip().replace('[', '').replace(']', '') for b in argopt.Bna.split(',')] # waveband names to match with zeropoints table
 
 ######
 # Formatting and database checks:
 ######
 # 1. Has SEDBYS been correctly set up on the local machine?
-localDB_trunk = check_ldb(argopt.ldb) # returns pathlib.Path object
+localDB_trunk = check_ldb(argopt.ldb, minInterval=0) # always update before editing
 
 # 2. Does the parsed catalog exist in VizieR?...
 print('')
@@ -93,13 +83,11 @@ if len(attempt.keys()) == 0:
 else:
     print('   Passed: check complete.')
 
-# ...is it definitely not already in cat_setup.py?...
+# ...is it definitely not already in catalogs.json?...
 print('')
 print('Ensuring '+argopt.cat+' is not already in the list of queried catalogs...')
-catN = src_onlineDB('simbad')[0], src_onlineDB('simbad')[1]
-ldbN = src_localDB(localDB_trunk)[0], src_localDB(localDB_trunk)[1]
-if argopt.cat in [catN[0][i] for i in catN[0]] or argopt.cat in [ldbN[1][j] for j in ldbN[1]]:
-    print('   Error: catalog '+argopt.cat+' already included in cat_setup.py!')
+if get_catalogs(catalogs_file(localDB_trunk)).findCatalog(argopt.cat) is not None:
+    print('   Error: catalog '+argopt.cat+' already included in catalogs.json!')
     print('   ')
     sys.exit()
 else:
@@ -134,7 +122,7 @@ check_fmt(argopt.ref, argopt.nam, localDB_trunk, fluxU, fluxB)
 # 4. Are the lists of flux, error, units and resolution the same length?
 print('')
 print('Ensuring parsed lists have same length...')
-lists = [oW.split(','), oA.split(','), oM.split(','), oE.split(','), oU.split(','), oB.split(',')]
+lists = [waves, beams, fluxN, fluxE, fluxU, fluxB]
 it = iter(lists)
 the_len = len(next(it))
 if not all(len(l) == the_len for l in it):
@@ -149,6 +137,7 @@ else:
 ######
 # Finish:
 ######
-# 1. make changes to cat_setup.py
-outlist = [dID+oP, dID+oR, dID+oW, dID+oA, dID+oM, dID+oE, dID+oU, dID+oB]
-addToCat(outlist, localDB_trunk)
+# 1. add the new catalog to catalogs.json
+record = {'cat' : argopt.cat, 'ref' : argopt.ref, 'wav' : waves, 'res' : beams, 
+          'flux' : fluxN, 'err' : fluxE, 'unit' : fluxU, 'band' : fluxB}
+addToCat(argopt.nam, record, localDB_trunk)
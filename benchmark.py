@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import json
+import platform
+import tempfile
+import timeit
+import time
+import sys, os
+from contextlib import redirect_stdout
+from pathlib import Path
+import numpy as np
+from queryCache import QueryCache
+
+description = \
+"""
+description:
+    Benchmark the hot paths of SEDBYS and compare the timings
+    with the stored baselines (benchmarks/baselines.json):
+    - collect      queryDB.PhotSession.collect for a recorded
+                   object (the SIMBAD and VizieR responses saved
+                   with --record are replayed from
+                   benchmarks/recorded/, so no network access is
+                   needed; skipped if none have been recorded)
+    - ldbIndex     (re-)indexing all database/*.csv tables
+    - ldbMatch     matching target names in all database/*.csv
+                   tables, via the csv index and via the
+                   compiled database (ldbCompiled)
+    - csvIndex,    indexing and matching a synthetic local
+      csvFind      database table of N rows
+    - read_ascii,  reading synthetic photometry files of N rows
+      read_cleaned
+    - magToJy,     flux conversion of N measurements
+      JyToLamFlam
+    - read_spectrum  reading a synthetic spectrum of N points
+    - pltSED       fixaxis + pltSED of N points (drawn on the
+                   Agg canvas), and renderSED to a png file
+    - write_latex  the LaTeX table of N measurements
+    - import:<module>  the start-up time checks of startupTime.py
+    Synthetic datasets have N = 10^2 to 10^6 rows (10^5 for
+    the plots); use --max-rows for a quicker, partial run.
+    Each timing is the best of --repeat runs. The baselines
+    are scaled by the time of a fixed calibration workload on
+    this machine relative to that stored with them. A
+    benchmark fails if it is slower than its baseline by more
+    than --tolerance (a fraction of the baseline time) and
+    takes at least --min-time, or if a start-up check fails,
+    and the script then returns a non-zero exit status.
+    Baselines are only changed with --save, which stores the
+    timings just measured.
+
+"""
+epilog = \
+"""
+examples:
+    benchmark.py
+    benchmark.py --only=read_ascii,magToJy --max-rows=10000
+    benchmark.py --save
+    benchmark.py --record=HD_163296 --rad=10s
+
+"""
+
+# sizes of the synthetic datasets (drawing 10^6 points takes minutes, so
+# the plots stop at 10^5):
+SIZES = [10**2, 10**3, 10**4, 10**5, 10**6]
+PLOT_SIZES = SIZES[:4]
+
+# the responses replayed by the collect benchmark (see --record):
+RECORDED = 'HD163296.json'
+
+def sedDir():
+    """
+    Path to the SEDBYS directory ($SED_BUILDER, or else the
+    directory holding this script).
+    """
+    try:
+        return Path(os.environ['SED_BUILDER'])
+    except KeyError:
+        return Path(__file__).resolve().parent
+
+#############
+# Recorded SIMBAD and VizieR responses
+#############
+
+def encodeTable(table):
+    """
+    An astropy Table as a json-serialisable dictionary of
+    column name : list of values (masked values are None).
+    """
+    cols = {}
+    for c in table.colnames:
+        vals = table[c].tolist()
+        cols[c] = [v.decode('utf-8') if isinstance(v, bytes) else v for v in vals]
+    return {'names' : table.colnames, 'columns' : cols}
+
+def decodeTable(rec):
+    """
+    The astropy Table for a dictionary written by encodeTable.
+    """
+    from astropy.table import Table, MaskedColumn
+    table = Table(masked=any(None in rec['columns'][c] for c in rec['names']))
+    for c in rec['names']:
+        vals = rec['columns'][c]
+        known = [v for v in vals if v is not None]
+        fill = '' if len(known) != 0 and isinstance(known[0], str) else 0
+        table[c] = MaskedColumn([fill if v is None else v for v in vals], name=c,
+                                mask=[v is None for v in vals])
+    return table
+
+def encodeResponse(response):
+    """
+    A SIMBAD (Table) or VizieR (TableList) response as a
+    json-serialisable dictionary.
+    """
+    if response is None:
+        return {'type' : 'none'}
+    if hasattr(response, 'colnames'):
+        return {'type' : 'table', 'data' : encodeTable(response)}
+    return {'type' : 'tablelist', 'data' : {k : encodeTable(response[k]) for k in response.keys()}}
+
+def decodeResponse(rec):
+    """
+    The response for a dictionary written by encodeResponse.
+    """
+    if rec['type'] == 'none':
+        return None
+    if rec['type'] == 'table':
+        return decodeTable(rec['data'])
+    from astroquery.utils import TableList
+    return TableList([(k, decodeTable(t)) for k, t in rec['data'].items()])
+
+def recordObject(obj, radius, outFile, cacheDir=''):
+    """
+    Function to collate the photometry for obj (querying
+    SIMBAD and VizieR) and save every response received to
+    outFile, for use by the collect benchmark.
+    """
+    from queryDB import PhotSession
+    session = PhotSession(offline=True, cacheDir=cacheDir)
+    # query every service again, keeping the live responses:
+    session.cache = QueryCache(cacheDir, refresh=True, record=True)
+    with tempfile.TemporaryDirectory() as workDir:
+        cwd = os.getcwd()
+        os.chdir(workDir)
+        try:
+            output = session.collect(obj, radius, closest=True)
+        finally:
+            os.chdir(cwd)
+    if output is None:
+        print('Error: photometry could not be collated for '+obj)
+        sys.exit()
+    responses = {}
+    for s, p, r in session.cache.recorded:
+        responses[QueryCache.key(s, p)] = {'service' : s, 'params' : p, 
+                                           'response' : encodeResponse(r)}
+    rec = {'object' : obj, 'radius' : radius, 'recorded' : time.strftime('%Y-%m-%d'),
+           'responses' : list(responses.values())}
+    Path.mkdir(Path(outFile).parent, parents=True, exist_ok=True)
+    with open(outFile, 'w') as f_out:
+        json.dump(rec, f_out, indent=1)
+    print('Info: '+str(len(rec['responses']))+' responses for '+obj+' written to '+str(outFile))
+
+def replayCache(recFile, cacheDir):
+    """
+    Function to write the responses recorded in recFile (see
+    recordObject) to the query cache in cacheDir. Returns the
+    object name and search radius recorded.
+    """
+    with open(recFile) as f_in:
+        rec = json.load(f_in)
+    cache = QueryCache(cacheDir)
+    for r in rec['responses']:
+        cache.put(cache.key(r['service'], r['params']), r['service'],
+                  decodeResponse(r['response']))
+    return rec['object'], rec['radius']
+
+#############
+# Synthetic datasets
+#############
+
+def synthPhot(n, outFile, layout='raw', nref=20, seed=1):
+    """
+    Function to write a synthetic photometry file of n rows
+    (in the 'raw' _phot.dat or 'cleaned' layout) to outFile,
+    with bands drawn from zero_points.dat and references from
+    nref fake bibcodes (see synthBib).
+    """
+    from sed_input import get_zp
+    zp = get_zp(sedDir() / 'zero_points.dat')
+    bands = list(zp['zpF0'])
+    rng = np.random.default_rng(seed)
+    b = rng.integers(0, len(bands), n)
+    unit = rng.choice(['mag', 'mag', 'Jy', 'mJy'], n)
+    wv = np.array([zp['zpWave'][bands[i]] for i in b])*1e-6
+    flux = np.where(unit == 'mag', rng.uniform(4, 16, n), 10**rng.uniform(-3, 2, n))
+    eflux = np.round(flux*rng.uniform(0.01, 0.1, n), 4)
+    noerr = rng.random(n) < 0.1
+    uplim = (rng.random(n) < 0.05) & (unit != 'mag')
+    refs = [benchBibcode(i) for i in rng.integers(0, nref, n)]
+    with open(outFile, 'w') as f_out:
+        f_out.write('#Photometry obtained for BENCH '+str(n)+': synthetic benchmark data\n')
+        if layout == 'raw':
+            f_out.write('lam band mag e_mag f_mag u_mag beam obsDate ref\n')
+            f_out.write('m -- -- -- -- -- arcsec -- --\n')
+        else:
+            f_out.write('lam band lamFlam e_lamFlam f_lamFlam u_lamFlam beam obsDate ref\n')
+            f_out.write('m -- W/m^2 W/m^2 -- -- arcsec -- --\n')
+        for i in range(0, n):
+            f = '{:.4g}'.format(flux[i])
+            ef = f if uplim[i] else ('--' if noerr[i] else str(eflux[i]))
+            if layout == 'raw':
+                cols = [str(wv[i]), bands[b[i]], f, ef, '--', unit[i], '1.3', 'unknown', refs[i]]
+            else:
+                cols = [str(wv[i]), bands[b[i]], '{:.4g}'.format(flux[i]*1e-13),
+                        '{:.4g}'.format(eflux[i]*1e-13), '--', '1.3', 'unknown', refs[i]]
+            f_out.write(' '.join(cols)+'\n')
+    return outFile
+
+def benchBibcode(i):
+    """
+    Fake bibcode number i used in the synthetic datasets.
+    """
+    return '2000Bench.{:04d}....1A'.format(int(i))
+
+def synthBib(nref, outFile):
+    """
+    Function to write an ADS-style .bib file (entries tagged
+    by bibcode) for the nref fake bibcodes to outFile.
+    """
+    with open(outFile, 'w') as f_out:
+        for i in range(0, nref):
+            b = benchBibcode(i)
+            f_out.write('@ARTICLE{'+b+',\n       author = {{Author'+str(i)+'}, A.},\n'
+                        '         year = 2000,\n'
+                        '       adsurl = {https://ui.adsabs.harvard.edu/abs/'+b+'},\n}\n\n')
+    return outFile
+
+def synthSpectrum(n, outFile, seed=1):
+    """
+    Function to write a synthetic ISO SWS style spectrum (fits
+    file with wavelength, flux and two error columns) of n
+    points to outFile (whose name must contain 'sws').
+    """
+    from astropy.io import fits as pyfits
+    rng = np.random.default_rng(seed)
+    w = np.sort(rng.uniform(2.4, 45., n))
+    f = 10**rng.uniform(0, 2, n)
+    data = np.column_stack([w, f, 0.05*f, 0.1*f])
+    pyfits.PrimaryHDU(data).writeto(outFile, overwrite=True)
+    return outFile
+
+def synthTable(n, outFile, seed=1):
+    """
+    Function to write a synthetic local database table of n
+    rows to outFile, with about n/3 distinct targets (some
+    with binary components, e.g. 'BENCH 12 A').
+    """
+    rng = np.random.default_rng(seed)
+    targ = rng.integers(0, max(n//3, 1), n)
+    comp = rng.choice(['', '', '', ' A', ' B'], n)
+    with open(outFile, 'w') as f_out:
+        f_out.write('Target,F1300,e_F1300,ObsDate\n')
+        for i in range(0, n):
+            f_out.write('BENCH '+str(targ[i])+comp[i]+','+'{:.3g}'.format(rng.uniform(1, 500))+
+                        ',--,averaged\n')
+    return outFile
+
+#############
+# Benchmarks: each function sets up the benchmark (untimed) and
+# returns the function to be timed.
+#############
+
+def benchCollect(n, workDir):
+    recFile = sedDir() / 'benchmarks' / 'recorded' / RECORDED
+    if not recFile.exists():
+        return None # see --record
+    from queryDB import PhotSession
+    cacheDir = workDir / 'cache'
+    obj, radius = replayCache(recFile, cacheDir)
+    session = PhotSession(offline=True, cacheDir=str(cacheDir), replay=True)
+    output = workDir / obj.replace(' ', '') / (obj.replace(' ', '')+'_phot.dat')
+    def run():
+        if output.exists():
+            output.unlink()
+        if session.collect(obj, radius, closest=True) is None:
+            raise RuntimeError('photometry could not be collated for '+obj)
+    return run
+
+def localDB():
+    from cat_setup import src_localDB
+    ldb = src_localDB(sedDir())
+    if ldb is None:
+        raise FileNotFoundError(str(sedDir() / 'database'))
+    return ldb
+
+def matchSweep(lookup, ldbN, names):
+    """
+    Function returning a function which matches each of names
+    (and binary components of names) in every local table.
+    """
+    def run():
+        for n in names:
+            for o in ldbN:
+                lookup.find(o, [n])
+                lookup.findComponents(o, [n])
+    return run
+
+def sampleNames(index, nNames=100):
+    """
+    nNames target names (and parent star names) from the
+    local database plus a few names that are not in it.
+    """
+    names = sorted(set(list(index.names)+list(index.parents)))
+    step = max(len(names)//nNames, 1)
+    return names[::step][:nNames]+['NOT IN DB '+str(i) for i in range(0, 10)]
+
+def benchLdbIndex(n, workDir):
+    from localIndex import LocalIndex
+    ldbN = localDB()[0]
+    indexFile = workDir / 'index.json'
+    def run():
+        if indexFile.exists():
+            indexFile.unlink()
+        LocalIndex(ldbN, indexFile)
+    return run
+
+def benchLdbMatch(n, workDir):
+    from localIndex import LocalIndex
+    ldbN = localDB()[0]
+    index = LocalIndex(ldbN, workDir / 'index.json')
+    return matchSweep(index, ldbN, sampleNames(index))
+
+def benchLdbCompiled(n, workDir):
+    from localIndex import LocalIndex, CompiledDB
+    from buildDB import compileDB
+    ldb = localDB()
+    dbFile = workDir / 'localDB.sqlite'
+    compileDB(sedDir(), dbFile)
+    index = LocalIndex(ldb[0], workDir / 'index.json')
+    return matchSweep(CompiledDB(dbFile, ldb), ldb[0], sampleNames(index))
+
+def benchCsvIndex(n, workDir):
+    from localIndex import LocalIndex
+    ldbN = {'BENCH' : synthTable(n, workDir / ('bench_'+str(n)+'.csv'))}
+    indexFile = workDir / ('index_'+str(n)+'.json')
+    def run():
+        if indexFile.exists():
+            indexFile.unlink()
+        LocalIndex(ldbN, indexFile)
+    return run
+
+def benchCsvFind(n, workDir):
+    from localIndex import LocalIndex
+    ldbN = {'BENCH' : synthTable(n, workDir / ('bench_'+str(n)+'.csv'))}
+    index = LocalIndex(ldbN, workDir / ('index_'+str(n)+'.json'))
+    return matchSweep(index, ldbN, sampleNames(index))
+
+def benchReadAscii(n, workDir):
+    from sed_input import read_ascii
+    photF = synthPhot(n, workDir / ('bench_'+str(n)+'_phot.dat'))
+    return lambda: read_ascii(photF)
+
+def benchReadCleaned(n, workDir):
+    from sed_input import read_cleaned
+    photF = synthPhot(n, workDir / ('bench_'+str(n)+'_phot_cleaned_0.dat'), layout='cleaned')
+    return lambda: read_cleaned(photF)
+
+def benchMagToJy(n, workDir):
+    from sed_input import read_phot, magToJy
+    phot = read_phot(synthPhot(n, workDir / ('bench_'+str(n)+'_phot.dat')))
+    mags = phot[phot['unit'] == 'mag']
+    return lambda: magToJy(mags['mag'], mags['emag'], mags['band'])
+
+def benchJyToLamFlam(n, workDir):
+    from sed_input import JyToLamFlam
+    rng = np.random.default_rng(1)
+    jy, wave = 10**rng.uniform(-3, 2, n), 10**rng.uniform(-7, -3, n)
+    return lambda: JyToLamFlam(jy, 0.1*jy, wave)
+
+def benchReadSpectrum(n, workDir):
+    from sed_input import read_spectrum
+    specF = synthSpectrum(n, workDir / ('bench_'+str(n)+'_sws.fits'))
+    return lambda: read_spectrum(specF)
+
+def benchPltSED(n, workDir):
+    import matplotlib.pyplot as plt
+    from plot import pltSED
+    from sed_input import convert_sed
+    photF = synthPhot(n, workDir / ('bench_'+str(n)+'_phot.dat'))
+    wvlen,wband,f,ef,flag,beam,odate,ref = convert_sed(photF)
+    def run():
+        pltSED(photF, 'default', f, ef, wvlen)
+        plt.figure(1).canvas.draw()
+        plt.close(1)
+    return run
+
+def benchRenderSED(n, workDir):
+    from plot import renderSED
+    photF = synthPhot(n, workDir / ('bench_'+str(n)+'_phot.dat'))
+    return lambda: renderSED(photF, [io.BytesIO()], fmt='png')
+
+def benchWriteLatex(n, workDir):
+    from toLaTex import write_latex
+    from citing import BibStore, fileFetcher
+    objDir = workDir / ('latex_'+str(n))
+    Path.mkdir(objDir, exist_ok=True)
+    photF = synthPhot(n, objDir / ('bench_'+str(n)+'_phot.dat'))
+    store, fetcher = BibStore(':memory:'), fileFetcher(synthBib(20, workDir / 'ads.bib'))
+    def run():
+        for f in list(objDir.glob('sedbys_*')):
+            f.unlink()
+        write_latex([photF], store=store, fetcher=fetcher)
+    return run
+
+# name : (function setting up the benchmark, dataset sizes or None)
+BENCHMARKS = {'collect' : (benchCollect, None),
+              'ldbIndex' : (benchLdbIndex, None),
+              'ldbMatch' : (benchLdbMatch, None),
+              'ldbCompiled' : (benchLdbCompiled, None),
+              'csvIndex' : (benchCsvIndex, SIZES),
+              'csvFind' : (benchCsvFind, SIZES),
+              'read_ascii' : (benchReadAscii, SIZES),
+              'read_cleaned' : (benchReadCleaned, SIZES),
+              'magToJy' : (benchMagToJy, SIZES),
+              'JyToLamFlam' : (benchJyToLamFlam, SIZES),
+              'read_spectrum' : (benchReadSpectrum, SIZES),
+              'pltSED' : (benchPltSED, PLOT_SIZES),
+              'renderSED' : (benchRenderSED, PLOT_SIZES),
+              'write_latex' : (benchWriteLatex, SIZES)}
+
+def timeBench(func, repeat=3):
+    """
+    Function to time func(): the best time per call (seconds)
+    of repeat runs, each of enough calls to take at least 0.2 s.
+    """
+    timer = timeit.Timer(func)
+    number, total = timer.autorange()
+    return min([total/number]+[t/number for t in timer.repeat(repeat-1, number)])
+
+def calibrate(repeat=3):
+    """
+    Time (seconds) of a fixed workload of python loops and
+    numpy operations, used as the unit in which benchmark
+    timings are compared with the baselines (so that the
+    baselines may be used on a faster or slower machine).
+    """
+    x = np.random.default_rng(1).random(10**5)
+    def run():
+        s = 0
+        for i in range(0, 50000):
+            s += i*i
+        np.sort(x)
+        np.log10(x).sum()
+    return timeBench(run, repeat)
+
+def machine():
+    """
+    Description of the machine the benchmarks are run on.
+    """
+    return {'platform' : platform.platform(), 'python' : platform.python_version(),
+            'processor' : platform.processor() or platform.machine(), 'cpus' : os.cpu_count()}
+
+def readBaselines(baseFile):
+    """
+    The stored baselines (empty if baseFile does not exist).
+    """
+    if not Path(baseFile).exists():
+        return {'machine' : None, 'results' : {}}
+    with open(baseFile) as f_in:
+        return json.load(f_in)
+
+def saveBaselines(baseFile, results, base, cal):
+    """
+    Function to store results (benchmark id : seconds) as the
+    baselines in baseFile, keeping the baselines of any
+    benchmarks which were not run (scaled to the calibration
+    time cal of this run, see calibrate).
+    """
+    if base.get('calibration') is not None:
+        scale = cal/base['calibration']
+        base['results'] = {b : t*scale for b, t in base['results'].items()}
+    base['results'].update(results)
+    base['calibration'] = cal
+    base['machine'] = machine()
+    base['saved'] = time.strftime('%Y-%m-%d')
+    tmpF = Path(str(baseFile)+'.tmp')
+    with open(tmpF, 'w') as f_out:
+        json.dump(base, f_out, indent=1, sort_keys=True)
+        f_out.write('\n')
+    tmpF.replace(baseFile)
+
+def report(bid, t, baseline, tolerance, minTime, problems=[]):
+    """
+    Function to print the result for benchmark bid (time t,
+    in seconds) against its baseline (scaled to this machine,
+    see calibrate). Timings shorter than minTime are dominated
+    by noise, so they are reported but never fail against the
+    baseline. Returns True if the benchmark failed.
+    """
+    line = '{:22s} {:11.4g} ms'.format(bid, t*1e3)
+    fail = len(problems) != 0
+    if baseline is None:
+        line += '   (no baseline)'
+    else:
+        ratio = t/baseline
+        line += '  {:11.4g} ms  x{:.2f}'.format(baseline*1e3, ratio)
+        if ratio > 1+tolerance and max(t, baseline) >= minTime:
+            problems = ['slower than baseline by more than {:.0f}%'.format(tolerance*100)]+problems
+            fail = True
+    if fail:
+        line += '   FAIL: '+'; '.join(problems)
+    print(line)
+    return fail
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=description,epilog=epilog,
+             formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only",dest="only",default='',type=str,
+                        help='Comma-separated list of benchmarks to run (default: all)')
+    parser.add_argument("--max-rows",dest="maxRows",default=SIZES[-1],type=int,
+                        help='Largest synthetic dataset to use (default 1000000)')
+    parser.add_argument("--repeat",dest="repeat",default=3,type=int,
+                        help='Number of timing runs (the fastest is used, default 3)')
+    parser.add_argument("--tolerance",dest="tolerance",default=0.5,type=float,
+                        help='Fail if slower than the baseline by more than this fraction (default 0.5)')
+    parser.add_argument("--min-time",dest="minTime",default=1.,type=float,
+                        help='Timings (ms) below which a benchmark never fails against its baseline (default 1)')
+    parser.add_argument("--baselines",dest="baseFile",default='',type=str,
+                        help='Baselines file (default: benchmarks/baselines.json)')
+    parser.add_argument("--save",dest="save",action='store_true',
+                        help='Store the timings measured as the new baselines')
+    parser.add_argument("--no-startup",dest="noStartup",action='store_true',
+                        help='Skip the start-up time checks (see startupTime.py)')
+    parser.add_argument("--record",dest="record",default='',type=str,
+                        help='Record the SIMBAD/VizieR responses for this object (requires network access)')
+    parser.add_argument("--rad",dest="rad",default='10s',type=str,
+                        help='Search radius to use with --record (default 10s)')
+    parser.add_argument("--cache-dir",dest="cacheDir",default='',type=str,
+                        help='Query cache directory to use with --record')
+
+    argopt = parser.parse_args()
+
+    os.environ.setdefault('SED_BUILDER', str(sedDir()))
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+
+    if argopt.record != '':
+        obj = argopt.record.replace('_', ' ')
+        recordObject(obj, argopt.rad, sedDir() / 'benchmarks' / 'recorded' /
+                     (obj.replace(' ', '')+'.json'), argopt.cacheDir)
+        sys.exit()
+
+    baseFile = Path(argopt.baseFile) if argopt.baseFile != '' else \
+               sedDir() / 'benchmarks' / 'baselines.json'
+    base = readBaselines(baseFile)
+    # compare the timings relative to the calibration workload, so that the
+    # baselines are scaled to the speed of this machine:
+    cal = calibrate(argopt.repeat)
+    if base.get('calibration') is not None:
+        scale = cal/base['calibration']
+    else:
+        print('Warning: the baselines have no calibration time, so they are not scaled to this machine.')
+        print('Use --save to store baselines for this machine.')
+        print('')
+        scale = 1.
+    baselines = {b : t*scale for b, t in base['results'].items()}
+    minTime = argopt.minTime*1e-3
+
+    only = [b.strip() for b in argopt.only.split(',')] if argopt.only != '' else []
+    for b in only:
+        if b not in BENCHMARKS and b != 'import' and not b.startswith('import:'):
+            print('Error: unknown benchmark '+b+' (choose from '+', '.join(BENCHMARKS)+', import)')
+            sys.exit(1)
+
+    results, nFail = {}, 0
+    print('{:22s} {:>14s} {:>14s}'.format('benchmark', 'time', 'baseline'))
+    with tempfile.TemporaryDirectory() as tmpDir:
+        cwd = os.getcwd()
+        try:
+            for name, (setup, sizes) in BENCHMARKS.items():
+                if only != [] and name not in only:
+                    continue
+                for n in (sizes if sizes is not None else [None]):
+                    if n is not None and n > argopt.maxRows:
+                        continue
+                    bid = name if n is None else name+':'+str(n)
+                    workDir = Path(tmpDir) / bid.replace(':', '_')
+                    Path.mkdir(workDir)
+                    os.chdir(workDir) # queryDB writes the photometry to the working directory
+                    with open(os.devnull, 'w') as quiet, redirect_stdout(quiet):
+                        run = setup(n, workDir)
+                        t = timeBench(run, argopt.repeat) if run is not None else None
+                    if t is None:
+                        print('{:22s} {:>14s}   (skipped: nothing recorded in benchmarks/recorded/, '
+                              'see --record)'.format(bid, '--'))
+                        continue
+                    results[bid] = t
+                    if report(bid, t, baselines.get(bid), argopt.tolerance, minTime):
+                        nFail += 1
+        finally:
+            os.chdir(cwd)
+
+    if not argopt.noStartup and (only == [] or any(b.startswith('import') for b in only)):
+        from startupTime import BUDGETS, checkModule
+        for module, (budget, heavy) in BUDGETS.items():
+            bid = 'import:'+module
+            if only != [] and 'import' not in only and bid not in only:
+                continue
+            best, imports, problems = checkModule(module, budget, heavy, sedDir(), argopt.repeat)
+            results[bid] = best
+            if report(bid, best, baselines.get(bid), argopt.tolerance, minTime, problems):
+                nFail += 1
+
+    print('')
+    unchecked = [b for b in base['results'] if b not in results]
+    if len(unchecked) != 0:
+        print('Info: '+str(len(unchecked))+' baselines not checked in this run (see --only and --max-rows).')
+    if argopt.save:
+        saveBaselines(baseFile, results, base, cal)
+        print('Info: '+str(len(results))+' baselines saved to '+str(baseFile))
+    print('Info: '+str(len(results)-nFail)+' of '+str(len(results))+' benchmarks passed.')
+    if nFail != 0 and not argopt.save:
+        sys.exit(1)
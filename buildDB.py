@@ -1,14 +1,62 @@
 import subprocess, sys, os
 import urllib.request
-from cat_setup import src_localDB, src_onlineDB
+from cat_setup import src_localDB
+from catalogs import get_catalogs, catalogs_file
+from localIndex import fileHash, parentName, metaHash
 import datetime
+import time
+import argparse
+import sqlite3
+import csv
 from pathlib import Path
 
-def check_ldb(ldb):
+def sync_interval():
+    """
+    Default minimum time (in seconds) between updates of the local
+    SEDBYS git repo. This may be set using environment variable
+    $SEDBYS_SYNC_INTERVAL (default one hour).
+    """
+    try:
+        return float(os.getenv('SEDBYS_SYNC_INTERVAL', 3600))
+    except ValueError:
+        return 3600.
+
+def sync_lock(localDB_trunk, maxAge=600.):
+    """
+    Function to take the lock (file .sedbys_sync.lock, created
+    with O_EXCL) on updating the local SEDBYS git repo, so that
+    only one process runs git pull at a time. A lock older than
+    maxAge seconds is taken to be left over from a process which
+    died and is removed. Returns the lock file path, or None if
+    another update is in progress.
+    """
+    lock = Path.expanduser(localDB_trunk) / '.sedbys_sync.lock'
+    for attempt in range(0, 2):
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return lock
+        except FileExistsError:
+            try:
+                if time.time()-lock.stat().st_mtime < maxAge:
+                    return None
+                lock.unlink() # stale lock
+            except FileNotFoundError:
+                pass # released in the meantime
+    return None
+
+def check_ldb(ldb, offline=False, minInterval=None, background=False):
     """
     Function to test whether SEDBYS has been installed and
     set-up correctly. 
     - ldb is a pathlib.Path object
+    - the local SEDBYS git repo is updated (git pull) unless
+      offline=True or the last successful update (recorded in
+      stamp file .sedbys_sync) was less than minInterval seconds 
+      ago (default: see sync_interval). Use minInterval=0 to 
+      always update. Only one process updates the repo at a
+      time (see sync_lock); others carry on without updating.
+    - background=True runs the update in the background rather
+      than waiting for it to complete.
     """
     if type(ldb) != type(Path('')):
         ldb = Path(ldb)
@@ -48,16 +96,44 @@ def check_ldb(ldb):
     else:
         localDB_trunk = ldb
     
+    if minInterval is None:
+        minInterval = sync_interval()
+    stamp = Path.expanduser(localDB_trunk) / '.sedbys_sync'
+    if offline:
+        print('Info: offline mode, local SEDBYS git repo not updated.')
+        return localDB_trunk
+    elif stamp.exists() and time.time()-stamp.stat().st_mtime < minInterval:
+        # recently updated: don't pay for another git pull
+        return localDB_trunk
+    
+    lock = sync_lock(localDB_trunk)
+    if lock is None:
+        print('Info: local SEDBYS git repo is already being updated by another process.')
+        return localDB_trunk
+    
     with cd(localDB_trunk):
+        if background:
+            print('Updating local SEDBYS git repo in the background...')
+            # the lock is released by the background process once git pull has finished:
+            subprocess.Popen('git pull -q && touch .sedbys_sync; rm -f .sedbys_sync.lock', 
+                             shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return localDB_trunk
+        
         print('Ensuring local SEDBYS git repo is up-to-date...')
-        uptodate = subprocess.call('git pull', shell=True)
+        try:
+            uptodate = subprocess.call('git pull', shell=True)
+        finally:
+            lock.unlink()
         if uptodate == 1:
             print('')
             print('Error: local changes clash with repository updates!')
             print('Please rectify these before continuing.')
             print('')
             sys.exit()
+        elif uptodate != 0:
+            print('Warning: local SEDBYS git repo could not be updated.')
         else:
+            stamp.touch()
             print('   Passed: check complete.')
     
     return localDB_trunk
@@ -80,9 +156,7 @@ def check_fmt(ref, nam, ldb, fluxU, fluxB):
     # 2. Will the catalog identifier be unique to the database?...
     print('')
     print('Ensuring '+nam+' is a unique and valid identifier...')
-    catN = src_onlineDB('simbad')[0]
-    ldbN = src_localDB(ldb)[0]
-    if nam in catN.keys() or nam in ldbN.keys():
+    if nam in get_catalogs(catalogs_file(ldb)):
         print('')
         print('Error: catalog identifier '+nam+' already in use!')
         print('')
@@ -154,98 +228,68 @@ def addData(catM, catE, catB, catW, catA, catU, odate, catR, m, em, b1, u, b2, d
     r.append(catR)  # reference
     d.append(odate) # observation date
 
-def addToLocal(outlist, localDB_trunk):
+def addToLocal(nam, record, localDB_trunk):
     """
-    Takes current local database file and adds new entry.
+    Adds a new entry for a local database table to catalogs.json.
     
-    - outlist follows the order:
-     [ldbN, ldbR, ldbW, ldbA, ldbM, ldbE, ldbU, ldbB]
+    - nam is the catalog identifier
+    - record is a dictionary with entries 'file' (path to the
+      table relative to localDB_trunk), 'ref', 'wav', 'res', 
+      'flux', 'err', 'unit' and 'band' (see catalogs.FIELDS)
     """
-    oldcat = []
-    with open(localDB_trunk / 'cat_setup.py', 'r') as inp:
-        for line in inp:
-            oldcat.append(line)
-
-    w = 0
-    editF = localDB_trunk / 'cat_setup_edit.py'
-    with open(editF, 'w') as output:
-        for o in oldcat:
-            if '}' not in o:
-                output.write(o)
-            else:
-                s = o.split("'")[0] # leading spaces
-                try:
-                    # add the new entry
-                    output.write(o.replace('}', ',')+s+outlist[w]+'}\n')
-                    w += 1
-                except IndexError:
-                    # notice that we're not where we're want to be
-                    output.write(o)
-    
-    editF.replace(localDB_trunk / 'cat_setup.py')
+    try:
+        get_catalogs(catalogs_file(localDB_trunk)).add('local', nam, record)
+    except KeyError:
+        print('')
+        print('Error: catalog identifier '+nam+' already in use!')
+        print('')
+        sys.exit()
     print('')
-    print('cat_setup.py successfully updated.')
+    print('catalogs.json successfully updated.')
     print('')
     print('-------------------------------------------------------------------')
     print('Please add your changes to the SEDBYS git repository e.g.')
     print('')
     print(' > cd '+str(localDB_trunk))
     print(' > git pull')
-    print(' > git add cat_setup.py')
+    print(' > git add catalogs.json')
     print(' > git add database')
-    print(' > git commit -m "added data from '+outlist[1]+' to local database" ')
+    print(' > git commit -m "added data from '+record['ref']+' to local database" ')
     print(' > git push')
     print('')
     print('You will be prompted for your git username to confirm your changes.')
     print('-------------------------------------------------------------------')
     print('')
 
-def addToCat(outlist, localDB_trunk):
+def addToCat(nam, record, localDB_trunk):
     """
-    Function to add entries to the python dictionary in
-    cat_setup.py which controls which catalogs on VizieR are
-    queried and stores catalog metadata so that SEDBYS knows
-    how to retrieve and flux-convert the data in the catalog.
-    """
-    oldcat = []
-    with open(localDB_trunk / 'cat_setup.py', 'r') as inp:
-        for line in inp:
-            oldcat.append(line)
-    
-    w = 0
-    o = 0
-    editF = localDB_trunk / 'cat_setup_edit.py'
-    with open(editF, 'w') as output:
-        # account for the fact that src_onlineDB is not the first 
-        # function defined in cat_setup.py
-        while 'def src_onlineDB(' not in oldcat[o]:
-            output.write(oldcat[o])
-            o += 1
-        
-        for i in range(o, len(oldcat)):
-            if '}' not in oldcat[i]:
-                output.write(oldcat[i])
-            else:
-                s = oldcat[i].split("'")[0] # leading spaces
-                try:
-                    # add the new entry
-                    output.write(oldcat[i].replace('}', ',')+s+outlist[w]+'}\n')
-                    w += 1
-                except IndexError:
-                    # notice that we're not where we're want to be
-                    output.write(oldcat[i])
+    Function to add an entry to catalogs.json, which controls 
+    which catalogs on VizieR are queried and stores catalog 
+    metadata so that SEDBYS knows how to retrieve and flux-convert
+    the data in the catalog.
     
-    editF.replace(localDB_trunk / 'cat_setup.py')
+    - nam is the catalog identifier
+    - record is a dictionary with entries 'cat' (the VizieR 
+      catalog code), 'ref', 'wav', 'res', 'flux', 'err', 'unit' 
+      and 'band' (see catalogs.FIELDS)
+    """
+    try:
+        get_catalogs(catalogs_file(localDB_trunk)).add('online', nam, record)
+    except KeyError:
+        print('')
+        print('Error: catalog identifier '+nam+' already in use!')
+        print('')
+        sys.exit()
     print('')
-    print('cat_setup.py successfully updated.')
+    print('catalogs.json successfully updated.')
     print('Please add your changes to the SEDBYS git repository e.g.')
     print('')
     print(' > cd '+str(localDB_trunk))
     print(' > git pull')
-    print(' > git add cat_setup.py')
+    print(' > git add catalogs.json')
     print(' > git add database')
     print(' > git add zero_points.dat')
-    print(' > git commit -m "added '+outlist[0]+' to list of queried VizieR catalogs" ')
+    print(' > git commit -m "added '+nam+' to list of queried VizieR catalogs" ')
     print(' > git push')
     print('')
     print('You will be prompted for your git username to confirm your changes.')
@@ -262,3 +306,98 @@ def check_date(d):
         return obsD
     except ValueError:
         return 'fail'
+
+
+def toFloat(val):
+    """
+    Typed version of a local database table entry (None
+    for entries such as '--').
+    """
+    try:
+        return float(val)
+    except ValueError:
+        return None
+
+def compileDB(localDB_trunk, outFile=None):
+    """
+    Compile all tables in the local database, together with
+    their metadata from catalogs.json, into a single SQLite 
+    file (default: database/sedbys_localDB.sqlite). Each 
+    measurement is stored with typed flux and error columns 
+    (plus the original text entries, for non-numeric values
+    such as '--') and is indexed on target name and parent 
+    star name. The wavelength, beam size, unit and band of 
+    each column are taken from the catalog metadata.
+    """
+    ldb = src_localDB(localDB_trunk)
+    if ldb is None:
+        print('Error: local database files not found!')
+        print('')
+        sys.exit()
+    ldbN, ldbR, ldbW, ldbA, ldbM, ldbE, ldbU, ldbB = ldb
+    if outFile is None:
+        outFile = localDB_trunk / 'database' / 'sedbys_localDB.sqlite'
+    
+    tmpF = Path(str(outFile)+'.tmp')
+    if tmpF.exists():
+        tmpF.unlink()
+    db = sqlite3.connect(str(tmpF))
+    db.execute('CREATE TABLE catalogs (catalog TEXT PRIMARY KEY, path TEXT, mtime REAL, '
+               'size INTEGER, sha1 TEXT, meta TEXT, ref TEXT)')
+    db.execute('CREATE TABLE phot (catalog TEXT, row INTEGER, target TEXT, parent TEXT, '
+               'col INTEGER, flux REAL, eflux REAL, flux_txt TEXT, eflux_txt TEXT, '
+               'fcol TEXT, ecol TEXT, obsdate TEXT)')
+    for o in ldbN:
+        print('Compiling '+o+' ('+ldbN[o].name+') ...')
+        st = ldbN[o].stat()
+        db.execute('INSERT INTO catalogs VALUES (?,?,?,?,?,?,?)', 
+                   (o, str(ldbN[o]), st.st_mtime, st.st_size, fileHash(ldbN[o]), 
+                    metaHash(ldb, o), ldbR[o]))
+        with open(ldbN[o]) as f_in:
+            reader = csv.DictReader(f_in, delimiter=',')
+            phot = []
+            for r, entry in enumerate(reader):
+                for m in range(0, len(ldbM[o])):
+                    ftxt, etxt = entry[ldbM[o][m]], entry[ldbE[o][m]]
+                    phot.append((o, r, entry['Target'], parentName(entry['Target']), m,
+                                 toFloat(ftxt), toFloat(etxt), ftxt, etxt, 
+                                 ldbM[o][m], ldbE[o][m], entry['ObsDate']))
+        db.executemany('INSERT INTO phot VALUES (?,?,?,?,?,?,?,?,?,?,?,?)', phot)
+    db.execute('CREATE INDEX phot_target ON phot (target, catalog)')
+    db.execute('CREATE INDEX phot_parent ON phot (parent, catalog)')
+    db.commit()
+    db.close()
+    tmpF.replace(outFile)
+    print('')
+    print('Compiled local database written to '+str(outFile))
+    print('')
+
+
+if __name__ == '__main__':
+    description = \
+    """
+    description:
+        Build steps for the SEDBYS local database. With --compile, 
+        all tables in the local database are compiled into a single
+        indexed SQLite file which is used by queryDB.py in place of
+        the csv files (for as long as it is up to date with them).
+    """
+    epilog = \
+    """
+    examples:
+        python3 buildDB.py --compile
+    """
+    parser = argparse.ArgumentParser(description=description,epilog=epilog,
+             formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--compile",dest='compile',action='store_true',
+                        help='Compile the local database into a single SQLite file.')
+    parser.add_argument("--ldb",dest='ldb',default='',type=str,
+                        help='')
+    parser.add_argument("--offline",dest='offline',action='store_true',
+                        help='Do not update the local SEDBYS git repo (git pull)')
+    argopt = parser.parse_args()
+    
+    if argopt.compile:
+        compileDB(check_ldb(argopt.ldb, offline=argopt.offline))
+    else:
+        parser.print_help()
@@ -0,0 +1,171 @@
+import os
+import json
+from pathlib import Path
+
+# fields of each catalog entry in catalogs.json, in the order of the
+# dictionaries returned by cat_setup.src_localDB and src_onlineDB:
+# file (local table, relative to the local database trunk) or cat
+# (VizieR catalog code), bibliographic reference, wavelengths (m),
+# angular resolution / beam size, flux/magnitude column names and
+# their error column names, units and waveband names.
+FIELDS = {'local' : ['file', 'ref', 'wav', 'res', 'flux', 'err', 'unit', 'band'],
+          'online' : ['cat', 'ref', 'wav', 'res', 'flux', 'err', 'unit', 'band']}
+
+def default_catalogs():
+    """
+    Path to the catalogs.json file in $SED_BUILDER (or, if not
+    set, in the SEDBYS directory holding this module).
+    """
+    try:
+        return Path(os.environ['SED_BUILDER']) / 'catalogs.json'
+    except KeyError:
+        return Path(__file__).resolve().parent / 'catalogs.json'
+
+def catalogs_file(localDB):
+    """
+    Path to the catalogs.json file in the local database trunk
+    localDB (default_catalogs() if there is none there).
+    """
+    catFile = Path(localDB) / 'catalogs.json'
+    if not catFile.exists():
+        return default_catalogs()
+    return catFile
+
+def dumpCatalogs(entries, f_out):
+    """
+    Write the local and online catalog entries to the open
+    file f_out as json, one catalog per line (so that changes
+    to catalogs.json are easy to review with git diff).
+    """
+    f_out.write('{\n')
+    for k, kind in enumerate(['local', 'online']):
+        f_out.write(' "'+kind+'" : {\n')
+        keys = list(entries[kind])
+        for i, key in enumerate(keys):
+            rec = ', '.join([json.dumps(fi)+' : '+json.dumps(entries[kind][key][fi])
+                             for fi in FIELDS[kind]])
+            f_out.write('  '+json.dumps(key)+' : {'+rec+'}'+(',' if i < len(keys)-1 else '')+'\n')
+        f_out.write(' }'+(',' if k == 0 else '')+'\n')
+    f_out.write('}\n')
+
+class CatalogRegistry:
+    """
+    The metadata of the local database tables and of the
+    VizieR catalogs queried by SEDBYS, as read from catFile
+    (catalogs.json). Each catalog is a record (a dictionary
+    with the fields in FIELDS) looked up by its key, e.g.
+    registry.get('online', 'TYCHO2')['cat'].
+
+    The paths to the local tables are only resolved (see path
+    and tables) for the catalogs requested.
+    """
+    def __init__(self, catFile=None):
+        if catFile is None:
+            catFile = default_catalogs()
+        self.catFile = Path(catFile)
+        self.mtime = self.catFile.stat().st_mtime_ns
+        with open(self.catFile) as f_in:
+            entries = json.load(f_in)
+        self.local = entries['local']
+        self.online = entries['online']
+
+    def __contains__(self, key):
+        return key in self.local or key in self.online
+
+    def entries(self, kind):
+        """
+        Dictionary of key : record for kind ('local' or 'online').
+        """
+        if kind == 'local':
+            return self.local
+        elif kind == 'online':
+            return self.online
+        raise ValueError("kind must be 'local' or 'online'")
+
+    def get(self, kind, key):
+        """
+        The record for catalog key (raises KeyError if there is
+        no catalog key of this kind).
+        """
+        return self.entries(kind)[key]
+
+    def findCatalog(self, cat):
+        """
+        Key of the online catalog with VizieR code cat (None if
+        cat is not queried).
+        """
+        for key, rec in self.online.items():
+            if rec['cat'] == cat:
+                return key
+        return None
+
+    def path(self, key, localDB):
+        """
+        Path to the local database table for catalog key.
+        - localDB is the local database trunk
+        """
+        return Path(localDB) / self.local[key]['file']
+
+    def tables(self, kind, keys=None, localDB=None):
+        """
+        The metadata for the catalogs in keys (default: all of
+        kind) as a list of eight dictionaries of key : value, one
+        per field, as returned by cat_setup.src_localDB and
+        src_onlineDB. For kind='local', the file paths are
+        resolved relative to localDB (see path).
+        """
+        entries = self.entries(kind)
+        if keys is None:
+            keys = list(entries)
+        out = [{key : entries[key][fi] for key in keys} for fi in FIELDS[kind]]
+        if kind == 'local':
+            out[0] = {key : self.path(key, localDB) for key in keys}
+        return out
+
+    def add(self, kind, key, record):
+        """
+        Function to add the catalog record (with the fields in
+        FIELDS[kind]) to catFile under key. The file is re-read
+        just before writing, so that entries added by another
+        process are kept, and is replaced atomically so that it
+        is never left partly written. Raises KeyError if key is
+        already in use.
+        """
+        missing = [fi for fi in FIELDS[kind] if fi not in record]
+        if missing != []:
+            raise ValueError('catalog record is missing '+', '.join(missing))
+        current = CatalogRegistry(self.catFile)
+        if key in current:
+            raise KeyError(key)
+        entries = {'local' : current.local, 'online' : current.online}
+        entries[kind][key] = {fi : record[fi] for fi in FIELDS[kind]}
+
+        tmpF = self.catFile.parent / (self.catFile.name+'.'+str(os.getpid())+'.tmp')
+        with open(tmpF, 'w') as f_out:
+            dumpCatalogs(entries, f_out)
+            f_out.flush()
+            os.fsync(f_out.fileno())
+        os.replace(tmpF, self.catFile)
+
+        self.local, self.online = entries['local'], entries['online']
+        self.mtime = self.catFile.stat().st_mtime_ns
+        _catRegistry[self.catFile.resolve()] = self
+
+# registries already read in, keyed on file path:
+_catRegistry = {}
+
+def get_catalogs(catFile=None):
+    """
+    Function to retrieve the CatalogRegistry for catFile
+    (default: catalogs.json in $SED_BUILDER), reading the file
+    only once per session (or again if it has been modified
+    since it was last read).
+    """
+    if catFile is None:
+        catFile = default_catalogs()
+    catFile = Path(catFile).resolve()
+    reg = _catRegistry.get(catFile)
+    if reg is None or reg.mtime != catFile.stat().st_mtime_ns:
+        reg = CatalogRegistry(catFile)
+        _catRegistry[catFile] = reg
+    return reg
@@ -1,17 +1,22 @@
 import urllib.request
+import urllib.parse
 import string
+import hashlib
 import os, sys
+import json
+import sqlite3
+import threading
 from datetime import date
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from queryCache import default_cache_dir
 
-def getBibTeX(bibref,tag_suf,outFile):
-    """
-    Function to retrieve BibTex entry from NASA ADS,
-    given a bibref. The tag is amended so that it follows
-    author last name + year + 'tag_suf'. 
-    """
-    if bibref == '1988iras....1.....B':
-        bibtex = ['>@article{1988iras....1.....B,\n',
+ADS_ABS = 'https://ui.adsabs.harvard.edu/abs/'
+ADS_EXPORT = 'https://api.adsabs.harvard.edu/v1/export/bibtex'
+
+# entries not available from NASA ADS:
+LOCAL_BIBTEX = {'1988iras....1.....B' : 
+                 ['@article{1988iras....1.....B,\n',
                   '       title={Infrared astronomical satellite (IRAS) catalogs and atlases. Volume 1: Explanatory supplement},\n',
                   '       keywords = {All Sky Photography, Catalogs, Indexes (Documentation), Infrared Astronomy Satellite, Cosmology, Galaxies, Star Formation, Stellar Evolution, Astrophysics},\n',
                   '       author={Beichman, CA and Neugebauer, G and Habing, HJ and Clegg, PE and Chester, Thomas J},\n',
@@ -19,24 +24,190 @@ def getBibTeX(bibref,tag_suf,outFile):
                   '       volume = {1},\n', 
                   '       month = jan,\n', 
                   '       adsurl = {https://ui.adsabs.harvard.edu/abs/1988iras....1.....B},\n'
-                  '}\n']
-    else:
-        baseURL = 'https://ui.adsabs.harvard.edu/abs/'
-        suf = '/exportcitation'
-        lines = urllib.request.urlopen(baseURL+bibref+suf).readlines()
-        lines = [l.decode('utf-8') for l in lines] # remove additional webpage encoding
-    
-        bibtex = []
-        for l in range(0, len(lines)):
-            if 'export-textarea ' in str(lines[l]):
-                bibtex.append(str(lines[l]))
-                t = l+1
-    
-        while '</textarea>' not in str(lines[t+1]):
-            bibtex.append(str(lines[t])) 
-            t += 1
-    
-    for item in bibtex:
+                  '}\n']}
+
+class BibStore:
+    """
+    Persistent store of the BibTeX entries retrieved from NASA
+    ADS, keyed on bibcode, so that each reference is only ever
+    downloaded once (BibTeX entries do not go out of date).
+    - dbFile defaults to bibtex.sqlite in the SEDBYS cache
+      directory (see queryCache.default_cache_dir); use
+      dbFile=':memory:' for a store that lasts one session.
+    """
+    def __init__(self, dbFile=None):
+        if dbFile is None or str(dbFile) == '':
+            dbFile = default_cache_dir() / 'bibtex.sqlite'
+        if str(dbFile) != ':memory:':
+            Path.mkdir(Path(dbFile).expanduser().parent, parents=True, exist_ok=True)
+            dbFile = Path(dbFile).expanduser()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(dbFile), check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS bibtex ('
+                             'bibcode TEXT PRIMARY KEY, entry TEXT)')
+
+    def get(self, bibrefs):
+        """
+        Return a dictionary of the stored entries (each a list
+        of lines) for those of bibrefs found in the store.
+        """
+        out = {}
+        with self._lock:
+            for b in bibrefs:
+                row = self._db.execute('SELECT entry FROM bibtex WHERE bibcode=?', 
+                                       (b,)).fetchone()
+                if row is not None:
+                    out[b] = json.loads(row[0])
+        return out
+
+    def put(self, entries):
+        """
+        Save each of the entries (a dictionary of bibcode: list
+        of lines) to the store.
+        """
+        with self._lock, self._db:
+            self._db.executemany('INSERT OR REPLACE INTO bibtex VALUES (?, ?)',
+                                 [(b, json.dumps(entries[b])) for b in entries])
+
+def unescape(line):
+    """
+    Replace the html character codes used in the ADS webpage.
+    """
+    line = line.replace('&#34;', '"')
+    line = line.replace('&#39;', "'")
+    return line.replace('&amp;', "&")
+
+def scrapeBibTeX(bibref):
+    """
+    Function to retrieve the BibTeX entry for bibref from the
+    NASA ADS export webpage. The entry is returned as a list of
+    lines.
+    """
+    lines = urllib.request.urlopen(ADS_ABS+bibref+'/exportcitation').readlines()
+    lines = [l.decode('utf-8') for l in lines] # remove additional webpage encoding
+
+    bibtex = []
+    for l in range(0, len(lines)):
+        if 'export-textarea ' in str(lines[l]):
+            bibtex.append(str(lines[l]))
+            t = l+1
+
+    while '</textarea>' not in str(lines[t+1]):
+        bibtex.append(str(lines[t])) 
+        t += 1
+    # remove the html preceding the entry type (e.g. @ARTICLE):
+    bibtex[0] = bibtex[0].split('>')[1]
+    return [unescape(item) for item in bibtex]
+
+def scrapeFetcher(workers=4):
+    """
+    Fetcher (see fetchBibTeX) which scrapes the ADS export
+    webpage for each bibcode, with at most workers requests
+    sent at once.
+    """
+    def fetch(bibrefs):
+        if workers <= 1 or len(bibrefs) <= 1:
+            return {b : scrapeBibTeX(b) for b in bibrefs}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {b : pool.submit(scrapeBibTeX, b) for b in bibrefs}
+            return {b : futures[b].result() for b in bibrefs}
+    return fetch
+
+def splitBibTeX(text):
+    """
+    Split BibTeX text into entries. Returns a dictionary of
+    entry tag: list of lines.
+    """
+    entries, tag = {}, None
+    for line in text.splitlines(True):
+        if line.startswith('@') and '{' in line:
+            tag = line.split('{')[1].split(',')[0].strip()
+            entries[tag] = []
+        if tag is not None:
+            entries[tag].append(line if line.endswith('\n') else line+'\n')
+    return entries
+
+def entryBibcode(lines):
+    """
+    The bibcode given in the ADS url of a BibTeX entry (None
+    if the entry has no ADS url).
+    """
+    for item in lines:
+        if 'adsurl' in item.split('=')[0]:
+            return urllib.parse.unquote(item.split('abs/')[-1].split('}')[0].strip())
+    return None
+
+def matchBibTeX(bibrefs, entries):
+    """
+    Match BibTeX entries (as returned by splitBibTeX) to the
+    bibcodes in bibrefs, either on the entry tag or else on
+    the ADS url given in the entry.
+    """
+    out = {}
+    for tag, lines in entries.items():
+        if tag in bibrefs:
+            out[tag] = lines
+            continue
+        b = entryBibcode(lines)
+        if b in bibrefs:
+            out[b] = lines
+    return out
+
+def readBib(bibFile):
+    """
+    Read the entries in a .bib file. Returns a dictionary of
+    entry tag: list of lines (empty if the file does not exist).
+    """
+    if not Path(bibFile).exists():
+        return {}
+    with open(bibFile) as f_in:
+        return splitBibTeX(f_in.read())
+
+def mergeBib(bibFiles, outFile):
+    """
+    Merge the entries in each of bibFiles into outFile, skipping
+    any reference (identified by the bibcode in its ADS url, or
+    else by its tag) which is already in outFile or an earlier
+    file. An entry whose tag is already taken by a different
+    reference is given a new tag (see tagSuffix). Returns the
+    number of entries written.
+    """
+    merged = readBib(outFile)
+    seen = {entryBibcode(lines) or tag for tag, lines in merged.items()}
+    n = 0
+    with open(outFile, 'a') as o:
+        for bibFile in bibFiles:
+            for tag, lines in readBib(bibFile).items():
+                bibref = entryBibcode(lines) or tag
+                if bibref in seen:
+                    continue
+                seen.add(bibref)
+                if tag in merged:
+                    auth, yr = entryAuthYear(lines)
+                    base = auth+yr if auth is not None and yr is not None else tag
+                    k = 0
+                    while tag in merged:
+                        tag = base+tagSuffix(bibref, k)
+                        k += 1
+                    print('Warning: '+bibref+' ('+str(bibFile)+') re-tagged as '+tag)
+                    lines = [lines[0].split('{')[0]+'{'+tag+',\n']+lines[1:]
+                merged[tag] = lines
+                # drop the blank separator lines read in with the entry:
+                while len(lines) > 1 and lines[-1].strip() == '':
+                    lines = lines[:-1]
+                o.writelines(lines)
+                o.write('\n')
+                n += 1
+    return n
+
+def entryAuthYear(lines):
+    """
+    The first author last name (without punctuation or spaces)
+    and the year of a BibTeX entry (None if not given).
+    """
+    auth, yr = None, None
+    for item in lines:
         if 'author' in item.split('=')[0]:
             auth = item.split('=')[1].split(',')[0]
             for i in string.punctuation:
@@ -45,20 +216,126 @@ def getBibTeX(bibref,tag_suf,outFile):
         if 'year' in item.split('=')[0]:
             yr = item.split('=')[1].split(',')[0]
             yr = yr.replace(' ', '')
+    return auth, yr
+
+def tagSuffix(bibref, n=0):
+    """
+    Two-letter tag suffix for bibref, derived from a hash of the 
+    bibcode so that a reference is always given the same tag.
+    n > 0 gives alternative suffixes, for use where two 
+    references would otherwise share the same tag.
+    """
+    h = int(hashlib.sha1((bibref+'#'*n).encode('utf-8')).hexdigest(), 16)
+    return string.ascii_lowercase[h % 26]+string.ascii_lowercase[(h // 26) % 26]
+
+def exportFetcher(token, chunk=1000):
+    """
+    Fetcher (see fetchBibTeX) which retrieves the BibTeX
+    entries for up to chunk bibcodes per request from the
+    NASA ADS export API (token is the ADS API token).
+    """
+    def fetch(bibrefs):
+        out = {}
+        for start in range(0, len(bibrefs), chunk):
+            req = urllib.request.Request(ADS_EXPORT, method='POST',
+                  data=json.dumps({'bibcode' : bibrefs[start:start+chunk]}).encode('utf-8'),
+                  headers={'Authorization' : 'Bearer '+token,
+                           'Content-Type' : 'application/json'})
+            with urllib.request.urlopen(req) as resp:
+                text = json.loads(resp.read().decode('utf-8'))['export']
+            out.update(matchBibTeX(bibrefs[start:start+chunk], splitBibTeX(text)))
+        return out
+    return fetch
+
+def fileFetcher(bibFile):
+    """
+    Fetcher (see fetchBibTeX) which reads the BibTeX entries
+    from a local file of ADS exports (i.e. with each entry
+    tagged by its bibcode), e.g. to work offline.
+    """
+    with open(bibFile) as f_in:
+        entries = splitBibTeX(f_in.read())
+    def fetch(bibrefs):
+        return matchBibTeX(bibrefs, entries)
+    return fetch
+
+def defaultFetcher():
+    """
+    Fetcher used when none is specified: the ADS export API
+    if an API token is set (environment variable $ADS_API_TOKEN
+    or $ADS_DEV_KEY), otherwise the ADS export webpage.
+    """
+    token = os.getenv('ADS_API_TOKEN') or os.getenv('ADS_DEV_KEY')
+    if token:
+        return exportFetcher(token)
+    return scrapeFetcher()
+
+def fetchBibTeX(bibrefs, store=None, fetcher=None):
+    """
+    Function to retrieve the BibTeX entries for a list of
+    bibcodes. Entries are read from store (a BibStore object)
+    where possible, and all others are retrieved with a
+    single call to fetcher (a function taking a list of
+    bibcodes and returning a dictionary of bibcode: list of
+    lines; default: see defaultFetcher) and added to store.
+    Returns a dictionary of bibcode: list of lines.
+    """
+    bibrefs = list(dict.fromkeys(bibrefs))
+    out = {b : LOCAL_BIBTEX[b] for b in bibrefs if b in LOCAL_BIBTEX}
+    if store is not None:
+        out.update(store.get([b for b in bibrefs if b not in out]))
+    miss = [b for b in bibrefs if b not in out]
+    if len(miss) != 0:
+        if fetcher is None:
+            fetcher = defaultFetcher()
+        got = fetcher(miss)
+        if store is not None:
+            store.put(got)
+        out.update(got)
+    return out
+
+def getBibTeX(bibref,tag_suf,outFile,store=None,fetcher=None,entries=None):
+    """
+    Function to retrieve BibTex entry from NASA ADS,
+    given a bibref. The tag is amended so that it follows
+    author last name + year + 'tag_suf'. 
+    - if tag_suf is None, it is generated from the bibcode
+      (see tagSuffix)
+    - the entry is only written to outFile if not already
+      present. The tag of the existing entry is returned.
+    - store and fetcher are as for fetchBibTeX
+    - entries is an optional dictionary of bibcode: list of
+      lines already retrieved with fetchBibTeX (for several
+      references at once), used instead of store and fetcher
+    Raises ValueError if no entry (or no author or year) is 
+    found for bibref.
+    """
+    if entries is not None:
+        bibtex = list(entries.get(bibref, []))
+    else:
+        bibtex = list(fetchBibTeX([bibref], store, fetcher).get(bibref, []))
+    
+    if len(bibtex) == 0:
+        raise ValueError('no BibTeX entry found for '+bibref)
+    auth, yr = entryAuthYear(bibtex)
+    
+    if auth is None or yr is None:
+        raise ValueError('no author or year found in the BibTeX entry for '+bibref)
     
-    try:
-        bibtex[0] = bibtex[0].split('>')[1].split('{')[0]+'{'+auth+yr+tag_suf+',\n'
-    except UnboundLocalError as ule:
-        print(bibtex)
-        print('')
-        print(ule)
-        sys.exit()
+    existing = readBib(outFile)
+    if tag_suf is None:
+        n = 0
+        tag_suf = tagSuffix(bibref)
+        # ensure that different references are not given the same tag:
+        while auth+yr+tag_suf in existing and entryBibcode(existing[auth+yr+tag_suf]) != bibref:
+            n += 1
+            tag_suf = tagSuffix(bibref, n)
+    if auth+yr+tag_suf in existing:
+        return auth+yr+tag_suf
+    bibtex[0] = bibtex[0].split('{')[0]+'{'+auth+yr+tag_suf+',\n'
     
     with open(outFile, 'a') as o:
         for item in bibtex:
-            item = item.replace('&#34;', '"')
-            item = item.replace('&#39;', "'")
-            item = item.replace('&amp;', "&")
             o.write(item)
         o.write('\n')
     
@@ -78,7 +355,10 @@ def bibrefCASSIS(objN):
         outFile.write(' (PNPS) of CNRS/INSU co-funded by CEA and CNES and through the')
         outFile.write(' "Programme National Physique et Chimie du Milieu Interstellaire"')
         outFile.write(' (PCMI) of CNRS/INSU with INC/INP co-funded by CEA and CNES.\n\n')
-    with open(Path(os.getcwd()) / Path(objN.replace(" ", "")) / Path('sedbys_'+objN.replace(" ","")+'.bib'), 'a') as outFile:
+    outBib = Path(os.getcwd()) / Path(objN.replace(" ", "")) / Path('sedbys_'+objN.replace(" ","")+'.bib')
+    if 'Lebouteiller2011zp' in readBib(outBib):
+        return
+    with open(outBib, 'a') as outFile:
         outFile.write('@ARTICLE{Lebouteiller2011zp,\n')
         outFile.write('   author = {{Lebouteiller}, V. and {Barry}, D.~J. and {Spoon}, ')
         outFile.write('H.~W.~W. and\n    {Bernard-Salas}, J. and {Sloan}, G.~C. and ')
@@ -108,7 +388,10 @@ def bibrefCASSIS(objN):
 def bibrefISO(objN):
     with open(Path(os.getcwd()) / Path(objN.replace(" ", "")) / Path('sedbys_'+objN.replace(" ","")+'.tex'), 'a') as outFile:
         outFile.write('Acknowledge the ISO SWS spectral Atlas by citing \citet{Sloan2003tj}.\n\n')
-    with open(Path(os.getcwd()) / Path(objN.replace(" ", "")) / Path('sedbys_'+objN.replace(" ","")+'.bib'), 'a') as outFile:
+    outBib = Path(os.getcwd()) / Path(objN.replace(" ", "")) / Path('sedbys_'+objN.replace(" ","")+'.bib')
+    if 'Sloan2003tj' in readBib(outBib):
+        return
+    with open(outBib, 'a') as outFile:
         outFile.write('@ARTICLE{Sloan2003tj,\n')
         outFile.write('   author = {{Sloan}, G.~C. and {Kraemer}, Kathleen E. and {Price},')
         outFile.write(' Stephan D. and {Shipman}, Russell F.},\n')
@@ -0,0 +1,181 @@
+import json
+import warnings
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from sed_input import read_ascii, read_cleaned, phot_layout, photToLamFlam, write_cleaned
+
+# rules applied where not set in the rules file (None = rule not applied):
+DEFAULT_RULES = {'maxBeam' : None,      # arcsec
+                 'saturation' : {},     # band : brightest reliable magnitude
+                 'newestDuplicates' : False,
+                 'outlierWindow' : 1.0, # dex in wavelength
+                 'outlierThreshold' : None} # dex in lamFlam
+
+def read_rules(rulesFile):
+    """
+    Function to read the cleaning rules from a json file, e.g.
+    {"maxBeam" : 20, "saturation" : {"2MASS:J" : 4.5},
+     "newestDuplicates" : true, "outlierThreshold" : 1.0}
+    Unknown rules are reported and ignored.
+    """
+    with open(rulesFile) as f_in:
+        user = json.load(f_in)
+    rules = dict(DEFAULT_RULES)
+    for r in user:
+        if r not in DEFAULT_RULES:
+            print('Warning: cleaning rule '+r+' not recognised and will be ignored.')
+            continue
+        rules[r] = user[r]
+    return rules
+
+def to_float(values):
+    """
+    Array of floats from a sequence of strings, with nan
+    for entries (e.g. '--' or 'unknown') that are not numbers.
+    """
+    out = np.full(len(values), np.nan)
+    for i, v in enumerate(values):
+        try:
+            out[i] = float(v)
+        except ValueError:
+            pass
+    return out
+
+def ref_year(ref):
+    """
+    Publication year of each reference in ref (from the first
+    four characters of the bibcode; 0 where not a year).
+    """
+    yr = to_float([r[:4] for r in ref])
+    yr[~np.isfinite(yr)] = 0
+    return yr
+
+def rule_beam(beam, maxBeam):
+    """
+    Flag points whose beam size (arcsec) exceeds maxBeam.
+    Points with no beam size given are retained.
+    """
+    return to_float(beam) > maxBeam
+
+def rule_saturation(wband, mag, unit, saturation):
+    """
+    Flag magnitudes brighter than (i.e. numerically less than)
+    the saturation limit given for their band in saturation.
+    """
+    limit = np.array([saturation.get(b, -np.inf) for b in wband], dtype=float)
+    return (np.asarray(unit) == 'mag') & (np.asarray(mag, dtype=float) < limit)
+
+def rule_newest(wband, ref, keep):
+    """
+    Flag, for each band measured more than once, the points
+    from all but the most recently published catalog. Only
+    points not already flagged (keep=True) are considered.
+    """
+    wband = np.asarray(wband)
+    yr = np.where(keep, ref_year(ref), -np.inf)
+    newest = {}
+    for b, y in zip(wband, yr):
+        newest[b] = max(newest.get(b, -np.inf), y)
+    return yr < np.array([newest[b] for b in wband])
+
+def rule_outliers(wvlen, f, keep, window, threshold):
+    """
+    Flag points lying more than threshold (dex) from the
+    smoothed SED, i.e. the median log(lamFlam) of the other
+    points within window (dex) in log(wavelength). Only points
+    not already flagged (keep=True) contribute to the median,
+    and points with no such neighbours are retained.
+    """
+    logx = np.log10(np.asarray(wvlen, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        logy = np.log10(np.asarray(f, dtype=float))
+    use = keep & np.isfinite(logy)
+    near = np.abs(logx[:, None]-logx[None, :]) <= window/2.
+    np.fill_diagonal(near, False) # a point does not count towards its own median
+    ymat = np.where(near & use[None, :], logy[None, :], np.nan)
+    with warnings.catch_warnings():
+        # all-nan windows (no retained neighbours) give a nan median
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        smooth = np.nanmedian(ymat, axis=1)
+    return np.isfinite(smooth) & (np.abs(logy-smooth) > threshold)
+
+def clean_phot(infile, rules):
+    """
+    Function to apply the cleaning rules to the photometry
+    in infile (either layout). Returns the photometry in the
+    cleaned layout (as returned by read_cleaned), an array
+    which is True for each point retained, and a dictionary
+    of the number of points removed by each rule.
+    """
+    if phot_layout(infile) == 'raw':
+        wvlen,wband,mag,emag,flag,unit,beam,odate,ref = read_ascii(infile)
+        f, ef = photToLamFlam(wvlen, wband, mag, emag, unit)
+    else:
+        wvlen,wband,f,ef,flag,beam,odate,ref = read_cleaned(infile)
+        mag, unit = f, ['W/m^2']*len(f)
+
+    keep = np.ones(len(wvlen), dtype=bool)
+    removed = {}
+    def apply(name, drop):
+        removed[name] = int(np.sum(keep & drop))
+        keep[drop] = False
+
+    if rules['maxBeam'] is not None:
+        apply('maxBeam', rule_beam(beam, rules['maxBeam']))
+    if rules['saturation']:
+        apply('saturation', rule_saturation(wband, mag, unit, rules['saturation']))
+    if rules['newestDuplicates']:
+        apply('newestDuplicates', rule_newest(wband, ref, keep))
+    if rules['outlierThreshold'] is not None and len(wvlen) != 0:
+        apply('outliers', rule_outliers(wvlen, f, keep, rules['outlierWindow'],
+                                        rules['outlierThreshold']))
+
+    return (wvlen,wband,f,ef,flag,beam,odate,ref), keep, removed
+
+def clean_file(infile, rules):
+    """
+    Function to clean the photometry in infile using rules and
+    write the retained points to a new _phot_cleaned_N.dat file
+    (see sed_input.write_cleaned). Returns the new file name and
+    the number of points removed by each rule.
+    """
+    infile = Path(infile)
+    phot, keep, removed = clean_phot(infile, rules)
+    outfile = write_cleaned(infile, phot, np.flatnonzero(~keep))
+    return outfile, removed
+
+def _clean_job(job):
+    try:
+        return job[0], clean_file(*job), None
+    except Exception as e:
+        return job[0], None, type(e).__name__+': '+str(e)
+
+def phot_files(paths):
+    """
+    The photometry files to clean for each of paths: a file is
+    used as given, while for a directory (e.g. a directory of
+    object directories) all queryDB.py output files (*_phot.dat)
+    within it are used.
+    """
+    files = []
+    for p in paths:
+        p = Path(p)
+        if p.is_dir():
+            files += sorted(p.rglob('*_phot.dat'))
+        else:
+            files.append(p)
+    return files
+
+def clean_files(files, rules, workers=1):
+    """
+    Function to clean each of files (see clean_file) using a
+    pool of up to workers processes. Returns a list of (file,
+    (new file, points removed by each rule), error message),
+    in the order of files.
+    """
+    jobs = [(f, rules) for f in files]
+    if workers <= 1 or len(jobs) <= 1:
+        return [_clean_job(j) for j in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_clean_job, jobs, chunksize=max(1, len(jobs)//(4*workers))))
@@ -0,0 +1,287 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from urllib import request, error
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queryCache import default_cache_dir
+
+def sha256sum(path):
+    """
+    sha256 hash of the contents of the file at path.
+    """
+    h = hashlib.sha256()
+    with open(path, 'rb') as f_in:
+        for block in iter(lambda: f_in.read(1024**2), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def linkFile(src, dest):
+    """
+    Make dest a hard link to src (falling back to a symbolic
+    link, then to a copy, where links are not supported).
+    """
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+    try:
+        os.link(src, dest)
+    except OSError:
+        try:
+            os.symlink(src, dest)
+        except OSError:
+            shutil.copy(src, dest)
+
+def headerName(headers):
+    """
+    Retrieve the original file name from the Content-disposition
+    header of an HTTP response (None if not provided).
+    """
+    disp = headers.get('Content-disposition')
+    if disp is None or '=' not in disp:
+        return None
+    return disp.split('=')[1].strip().strip('"')
+
+class SpectrumStore:
+    """
+    Content-addressed store of downloaded files, shared between
+    objects so that the same file (e.g. an ISO or Spitzer AOR
+    covering several targets) is only ever downloaded once.
+    - files are saved as <root>/<sha256[:2]>/<sha256>
+    - for each URL, the original file name, size and sha256 hash
+      are recorded in <root>/urls/<sha1 of URL>.json
+    Per-object directories are given (hard) links to the stored
+    files. root defaults to spectra/ in the query cache directory.
+    """
+    def __init__(self, root=None):
+        if root is None or str(root) == '':
+            root = default_cache_dir() / 'spectra'
+        self.root = Path(root).expanduser()
+        Path.mkdir(self.root / 'urls', parents=True, exist_ok=True)
+        Path.mkdir(self.root / 'tmp', parents=True, exist_ok=True)
+
+    def _urlFile(self, url):
+        return self.root / 'urls' / (hashlib.sha1(url.encode('utf-8')).hexdigest()+'.json')
+
+    def path(self, sha):
+        return self.root / sha[:2] / sha
+
+    def _writeRec(self, url, rec):
+        urlF = self._urlFile(url)
+        tmpU = Path(str(urlF)+'.'+str(os.getpid())+'.'+str(threading.get_ident())+'.tmp')
+        with open(tmpU, 'w') as f_out:
+            json.dump(rec, f_out)
+        tmpU.replace(urlF)
+
+    def lookup(self, url, verify=False):
+        """
+        Return the record (name, size, sha256) for url if the
+        file is in the store and intact, otherwise None. The
+        sha256 hash of the stored file is only checked (see
+        verify) if its size or modification time differ from
+        those recorded, or if verify is True. A stored file which
+        fails the check is removed so that it is downloaded again.
+        """
+        urlF = self._urlFile(url)
+        if not urlF.exists():
+            return None
+        try:
+            with open(urlF) as f_in:
+                rec = json.load(f_in)
+        except ValueError:
+            return None
+        blob = self.path(rec['sha256'])
+        if not blob.exists():
+            return None
+        st = blob.stat()
+        if not verify and st.st_size == rec['size'] and st.st_mtime_ns == rec.get('mtime'):
+            return rec
+        if st.st_size != rec['size'] or not self.verify(rec):
+            print('Warning: stored copy of '+url+' is corrupt, downloading it again...')
+            blob.unlink()
+            return None
+        # record the modification time of the checked file, so that it
+        # is not hashed again:
+        rec['mtime'] = st.st_mtime_ns
+        self._writeRec(url, rec)
+        return rec
+
+    def add(self, url, name, tmpFile):
+        """
+        Move a completed download (tmpFile) into the store and
+        record it against url. Returns the stored record.
+        """
+        sha = sha256sum(tmpFile)
+        blob = self.path(sha)
+        Path.mkdir(blob.parent, parents=True, exist_ok=True)
+        size = tmpFile.stat().st_size
+        if blob.exists() and blob.stat().st_size == size and sha256sum(blob) == sha:
+            tmpFile.unlink() # already stored under another URL
+        else:
+            tmpFile.replace(blob)
+        rec = {'url' : url, 'name' : name, 'size' : size, 'sha256' : sha,
+               'mtime' : blob.stat().st_mtime_ns}
+        self._writeRec(url, rec)
+        return rec
+
+    def verify(self, rec):
+        """
+        Check the stored file for rec against its sha256 hash.
+        """
+        return sha256sum(self.path(rec['sha256'])) == rec['sha256']
+
+def pidAlive(pid):
+    """
+    True if a process with id pid is running.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass # running, but owned by another user
+    return True
+
+def lockPart(partFile, wait=0.5):
+    """
+    Function to take the lock on the partial download partFile
+    (the file partFile.lock, created with O_EXCL and holding the
+    process id), waiting while another thread or process holds
+    it. A lock left by a process which is no longer running is
+    removed. Returns the lock file path.
+    """
+    lockF = Path(str(partFile)+'.lock')
+    while True:
+        try:
+            fd = os.open(lockF, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                with open(lockF) as f_in:
+                    pid = int(f_in.read().strip() or 0)
+            except (OSError, ValueError):
+                pid = 0
+            if pid != 0 and not pidAlive(pid):
+                try:
+                    lockF.unlink() # stale lock
+                except FileNotFoundError:
+                    pass
+                continue
+            time.sleep(wait)
+            continue
+        with os.fdopen(fd, 'w') as f_out:
+            f_out.write(str(os.getpid()))
+        return lockF
+
+def fetchURL(url, partFile, retries=3):
+    """
+    Download url to partFile, resuming from the end of any
+    existing partial download (HTTP Range request) and retrying
+    up to retries times on connection errors. The download is
+    checked against the Content-Length given by the server.
+    Returns the original file name given by the server (or None).
+    """
+    name = None
+    for attempt in range(0, retries+1):
+        start = partFile.stat().st_size if partFile.exists() else 0
+        req = request.Request(url)
+        if start > 0:
+            req.add_header('Range', 'bytes='+str(start)+'-')
+        try:
+            with request.urlopen(req) as resp:
+                name = headerName(resp.headers) or name
+                if start > 0 and resp.status != 206:
+                    # server ignored the range request: start again
+                    start = 0
+                length = resp.headers.get('Content-Length')
+                total = start+int(length) if length is not None else None
+                with open(partFile, 'ab' if start > 0 else 'wb') as f_out:
+                    shutil.copyfileobj(resp, f_out, 1024**2)
+            if total is None or partFile.stat().st_size == total:
+                return name
+            print('Warning: incomplete download of '+url+', retrying...')
+        except error.HTTPError as he:
+            if he.code == 416 and start > 0:
+                # requested range not satisfiable: the partial file is complete
+                # or corrupt, so start again
+                partFile.unlink()
+            elif he.code < 500:
+                raise
+        except (error.URLError, ConnectionError, TimeoutError):
+            if attempt == retries:
+                raise
+        time.sleep(2**attempt)
+    raise IOError('Download of '+url+' failed after '+str(retries+1)+' attempts')
+
+def downloadFile(url, outDir, name=None, store=None, retries=3):
+    """
+    Download url to directory outDir, unless already present.
+    - name is the file name to save to; if None, the name
+      provided by the server (Content-disposition) is used. This
+      is recorded in outDir (.<sha1 of URL>.name) so that the
+      file is not downloaded again.
+    - store is an optional SpectrumStore object: files already
+      in the store are linked into outDir without being
+      downloaded again, and new downloads are added to it.
+    Returns the path of the file in outDir.
+    """
+    outDir = Path(outDir)
+    Path.mkdir(outDir, parents=True, exist_ok=True)
+    urlHash = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    nameF = outDir / ('.'+urlHash+'.name')
+    if name is None and nameF.exists():
+        name = nameF.read_text().strip() or None
+    if store is not None:
+        rec = store.lookup(url)
+        if rec is not None:
+            out = outDir / Path(name or rec['name'])
+            if not (out.exists() and out.stat().st_size == rec['size']
+                    and os.path.samefile(out, store.path(rec['sha256']))):
+                linkFile(store.path(rec['sha256']), out)
+            return out
+        if name is not None and (outDir / name).exists():
+            return outDir / name # skip if present (though not in the store)
+        # the partial download is shared between processes (so that it can be
+        # resumed by a later run), so only one of them may write to it at a time:
+        partFile = store.root / 'tmp' / (urlHash+'.part')
+        lockF = lockPart(partFile)
+        try:
+            rec = store.lookup(url) # downloaded while waiting for the lock?
+            if rec is None:
+                srvName = fetchURL(url, partFile, retries=retries)
+                rec = store.add(url, name or srvName or url.split('/')[-1], partFile)
+        finally:
+            lockF.unlink()
+        if name is None:
+            name = rec['name']
+            nameF.write_text(name)
+        out = outDir / Path(name)
+        linkFile(store.path(rec['sha256']), out)
+        return out
+
+    if name is not None and (outDir / name).exists():
+        return outDir / name # skip if present
+    partFile = outDir / ('.'+urlHash+'.part')
+    srvName = fetchURL(url, partFile, retries=retries)
+    if name is None:
+        name = srvName or url.split('/')[-1]
+        nameF.write_text(name)
+    out = outDir / Path(name)
+    partFile.replace(out)
+    return out
+
+def downloadFiles(urls, outDir, names=None, workers=4, store=None, retries=3):
+    """
+    Download each of urls to outDir (see downloadFile) using a
+    pool of at most workers concurrent downloads. Returns the list
+    of downloaded file paths, in the same order as urls.
+    """
+    if names is None:
+        names = [None]*len(urls)
+    if workers <= 1 or len(urls) <= 1:
+        return [downloadFile(u, outDir, n, store, retries) for u, n in zip(urls, names)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(downloadFile, u, outDir, n, store, retries)
+                   for u, n in zip(urls, names)]
+        return [f.result() for f in futures]
@@ -1,13 +1,22 @@
 from urllib import request
 import subprocess
 import os
+import time
 from datetime import date
+import numpy as np
 import astropy.coordinates as coord
 from astropy import units as u
 from citing import bibrefCASSIS, bibrefISO
+from queryCache import default_cache_dir
+from download import downloadFiles
 from pathlib import Path
 
-def queryCASSIS(objN, RA, DEC, searchR=str(20)):
+ISO_URL = 'https://users.physics.unc.edu/~gcsloan/library/swsatlas/'
+
+# ISO SWS atlas entries already loaded in this session:
+_isoAtlas = {}
+
+def queryCASSIS(objN, RA, DEC, searchR=str(20), workers=4, store=None):
     """
     Query CASSIS using an object's RA and Dec (=RA and 
     Dec, respectively; units = decimal degrees), 
@@ -16,6 +25,9 @@ def queryCASSIS(objN, RA, DEC, searchR=str(20)):
     
     - objN is the object name. It is used to build the 
       directory in which to save the retrieved files.
+    - workers is the maximum number of files downloaded 
+      at once and store an optional download.SpectrumStore
+      (see download.downloadFiles)
     """
     baseURL = 'https://cassis.sirtf.com/'
     baseDir = Path(os.getcwd()) / Path(objN.replace(" ", ""))
@@ -44,15 +56,12 @@ def queryCASSIS(objN, RA, DEC, searchR=str(20)):
         print('|',str(baseURL))
         print('| ')
         print('| Saved file(s):')
+        # download the fits files (keeping the original file names) to the object
+        # directory:
+        gotF = downloadFiles([baseURL+wf for wf in wantF], baseDir, workers=workers, store=store)
         i = 1
-        for wf in wantF:
-            # download each fits file to the default local directory (=gotF[0]):
-            gotF = request.urlretrieve(baseURL+wf)
-            # retrieve original name of fits file:
-            outFile = gotF[1]._headers[[h[0] for h in gotF[1]._headers].index('Content-disposition')][1].split('=')[1]
-            # move the file from the default local directory to the object directory:
-            Path(gotF[0]).replace(baseDir / Path(outFile))
-            print('|',i,':',str(Path(objN) / Path(outFile)))
+        for outFile in gotF:
+            print('|',i,':',str(Path(objN) / Path(outFile.name)))
             i += 1
         print(' ---------------------------------------------------------')
         bibrefCASSIS(objN)
@@ -71,7 +80,97 @@ def queryCASSIS(objN, RA, DEC, searchR=str(20)):
         print('|    map)                                                  ')
         print(' ----------------------------------------------------------')
 
-def queryISO(objN, oRA, oDEC, searchR=str(20)):
+def parseISOAtlas(lines):
+    """
+    Parse the ISO SWS Atlas web page (aot1.html; a list of
+    lines) into arrays of Right Ascension and Declination 
+    (decimal degrees) and the name of the corresponding 
+    _sws.fit file for each entry in the atlas.
+    - the coordinates of each entry are nested in '<NOBR>'
+      tags and the fits file is the next '_sws.fit' link.
+    """
+    pos, files = [], []
+    waiting = []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        if len(waiting) != 0 and '_sws.fit' in line:
+            for p in waiting:
+                pos.append(p)
+                files.append(line.split('"')[1])
+            waiting = []
+        if '<NOBR>' in line:
+            eRA = line.split('<NOBR>')[1].split('</NOBR>')[0] # entry Right Ascension
+            eDEC = line.split('<NOBR>')[2].split('</NOBR>')[0] # entry Declination
+            waiting.append(eRA+' '+eDEC)
+    
+    if len(pos) == 0:
+        return np.array([]), np.array([]), np.array([], dtype=str)
+    # convert all entry coordinates in one go:
+    ePos = coord.SkyCoord(pos, unit=(u.hourangle, u.deg))
+    return ePos.ra.deg, ePos.dec.deg, np.array(files)
+
+def loadISOAtlas(cacheDir=None, refresh=False, noCache=False, ttl=30*86400):
+    """
+    Function to load the coordinates and file names of all
+    entries in Gregory C Sloan's SWS Atlas. The atlas web page
+    is only downloaded (and parsed) once: the result is saved
+    to iso_swsatlas.npz in cacheDir (default: see
+    queryCache.default_cache_dir) and kept in memory for the
+    rest of the session.
+    - the saved atlas is downloaded again once it is older than
+      ttl seconds (default 30 days, as for queryCache.QueryCache)
+    - refresh=True ignores the saved atlas and downloads it
+      again (once per session).
+    - noCache=True always downloads the atlas, and neither
+      reads nor writes iso_swsatlas.npz.
+    """
+    if noCache:
+        return parseISOAtlas(request.urlopen(ISO_URL+'aot1.html').readlines())
+    
+    if cacheDir is None or str(cacheDir) == '':
+        cacheDir = default_cache_dir()
+    atlasF = Path(cacheDir).expanduser() / 'iso_swsatlas.npz'
+    if atlasF in _isoAtlas:
+        return _isoAtlas[atlasF]
+    
+    if not refresh and atlasF.exists() and time.time()-atlasF.stat().st_mtime < ttl:
+        with np.load(atlasF) as npz:
+            atlas = (npz['ra'], npz['dec'], npz['files'])
+    else:
+        lines = request.urlopen(ISO_URL+'aot1.html').readlines()
+        atlas = parseISOAtlas(lines)
+        Path.mkdir(atlasF.parent, parents=True, exist_ok=True)
+        tmpF = atlasF.parent / ('iso_swsatlas.'+str(os.getpid())+'.tmp.npz')
+        np.savez(tmpF, ra=atlas[0], dec=atlas[1], files=atlas[2])
+        tmpF.replace(atlasF)
+    
+    _isoAtlas[atlasF] = atlas
+    return atlas
+
+def matchISO(objPos, searchR=str(20), cacheDir=None, refresh=False, noCache=False):
+    """
+    Function to find the ISO SWS Atlas spectra within searchR
+    arcseconds of each of the positions in objPos (a SkyCoord
+    object; scalar or array). Returns a list (one per position)
+    of the matching _sws.fit file names.
+    - cacheDir, refresh and noCache are as for loadISOAtlas
+    """
+    ra, dec, files = loadISOAtlas(cacheDir, refresh, noCache)
+    scalar = objPos.isscalar
+    if scalar:
+        objPos = objPos.reshape((1,))
+    matches = [[] for p in range(0, len(objPos))]
+    if len(files) != 0:
+        ePos = coord.SkyCoord(ra, dec, unit=(u.deg, u.deg))
+        iObj, iAtlas, sep, d3 = ePos.search_around_sky(objPos, float(searchR)*u.arcsec)
+        for p, e in sorted(zip(iObj, iAtlas)):
+            if files[e] not in matches[p]:
+                matches[p].append(str(files[e]))
+    return matches
+
+def queryISO(objN, oRA, oDEC, searchR=str(20), cacheDir=None, workers=4, store=None,
+             refresh=False, noCache=False):
     """
     Function to query Gregory C Sloan's SWS Atlas
     and retrieve calibrated ISO spectra.
@@ -79,48 +178,32 @@ def queryISO(objN, oRA, oDEC, searchR=str(20)):
       must be provided in units of degrees (as strings)
     - searchR is the search radius used to consider an entry
       in the online database as a match (in arcsec).
+    - the atlas itself is only downloaded once (see loadISOAtlas,
+      for cacheDir, refresh and noCache)
+    - workers is the maximum number of files downloaded at once
+      and store an optional download.SpectrumStore (see 
+      download.downloadFiles)
     """
     baseDir = Path(os.getcwd()) / Path(objN.replace(" ", ""))
-    baseURL = 'https://users.physics.unc.edu/~gcsloan/library/swsatlas/'
-    ws = 'aot1.html'
-    lines = request.urlopen(baseURL+ws).readlines()
+    baseURL = ISO_URL
+    oPos = coord.SkyCoord(float(oRA), float(oDEC), unit=(u.deg, u.deg))
+    
+    wantF = matchISO(oPos, searchR, cacheDir, refresh, noCache)[0]
+    if len(wantF) != 0:
+        # download the sws fits files to the object directory:
+        downloadFiles([baseURL+wf for wf in wantF], baseDir, names=wantF,
+                      workers=workers, store=store)
+        print(' ---------------------------------------------------------')
+        print('| Info: ISO spectra retrieved from:')
+        print("| Gregory C Sloan's SWS Atlas.")
+        print('|',baseURL)
+        print('| ')
+        print('| Saved file(s):')
     
-    # search for instances of 'NOBR' which are nested around the coordinates
-    found_match = 'False'
     i = 1
-    for line in lines:
-        if found_match == 'True':
-            # download the sws fits file:
-            if '_sws.fit' in str(line):
-                if i == 1:
-                    # ensure object directory exists:
-                    Path.mkdir(baseDir, parents=True, exist_ok=True)
-                    print(' ---------------------------------------------------------')
-                    print('| Info: ISO spectra retrieved from:')
-                    print("| Gregory C Sloan's SWS Atlas.")
-                    print('|',baseURL)
-                    print('| ')
-                    print('| Saved file(s):')
-                
-                gotF = request.urlretrieve(baseURL+str(line).split('"')[1])
-                # Retrieve original name of file:
-                outFile = str(line).split('"')[1]           
-                # move the file from the default download location to the object directory:
-                Path(gotF[0]).replace(baseDir / Path(outFile))
-                print('|',i,':',str(Path(objN) / Path(outFile)))
-                # return found_match to False:
-                found_match = 'False'
-                i += 1
-        
-        if '<NOBR>' in str(line):
-            eRA = str(line).split('<NOBR>')[1].split('</NOBR>')[0] # entry Right Ascension
-            eDEC = str(line).split('<NOBR>')[2].split('</NOBR>')[0] # entry Declination
-            ePos = coord.SkyCoord(eRA+' '+eDEC, unit=(u.hourangle, u.deg))
-            # Check whether these are within 'searchR' arcseconds of object RA and Dec:
-            oPos = coord.SkyCoord(oRA+' '+oDEC, unit=(u.deg, u.deg))
-            if ePos.separation(oPos).arcsecond <= float(searchR):
-                # if they are, make found_match = 'True'
-                found_match = 'True'
+    for outFile in wantF:
+        print('|',i,':',str(Path(objN) / Path(outFile)))
+        i += 1
     
     if i == 1:
         print(' ----------------------------------------------------------')
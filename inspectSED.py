@@ -1,13 +1,12 @@
 #!/usr/bin/env python3
 
 import argparse
-from sed_input import read_ascii, read_cleaned, read_spectrum, magToJy, JyToLamFlam
+from sed_input import read_cleaned, convert_sed, write_cleaned
 import sys, os
-import matplotlib.pyplot as plt
-from matplotlib.pyplot import errorbar, loglog
 import numpy as np
-from plot import pltSED
 from pathlib import Path
+# matplotlib (via plot) is only imported when plotting, so that
+# the rules mode and convert_sed start quickly (see startupTime.py).
 
 description = \
 """
@@ -23,191 +22,181 @@ examples:
     inspectPhot.py --phot=AKSco/AKSco_phot.dat
      --spec=AKSco/28902101_sws.fit,AKSco/cassis_yaaar_spcfw_12700160t.fits
      --pltR=0.1,1000
+    inspectSED.py --rules=rules.json --phot=sample/ --workers=8
 
 """
 
-parser = argparse.ArgumentParser(description=description,epilog=epilog,
-         formatter_class=argparse.RawDescriptionHelpFormatter)
-parser.add_argument("--phot",dest="phot",default='',type=str,
-                    help='Full path to photometry data file.')
-parser.add_argument("--spec",dest='spec',default='',type=str,
-                    help='Full path to the Spitzer spectrum file.')
-parser.add_argument("--scale",dest='specScale',default='',type=str,
-                    help='Scale factor to be applied to spectral flux')
-parser.add_argument("--pltR",dest='plt_range',default='[]',type=str,
-                    help='X-range (in microns) for plot window (free by default)')
-parser.add_argument("--savePlt",dest='saveplt',default=False,type=bool,
-                    help='Save a .pdf copy of the full and cleaned SEDs (default False)')
-
-argopt = parser.parse_args()
-
-if argopt.specScale != '':
-    if len(argopt.specScale.split(',')) != len(argopt.spec.split(',')):
-        print('Error: options parsed to --spec and to --scale ')
-        print('must have the same length!')
-        sys.exit()
-
-############
-# 1. Read in the photometric data:
-############
-infile = Path(argopt.phot)
-if infile.suffix == '.dat':
-    if 'cleaned' not in infile.name:
-        wvlen,wband,jy,ejy,flag,unit,beam,odate,ref = read_ascii(infile)
-    else:
-        wvlen,wband,f,ef,flag,beam,odate,ref = read_cleaned(infile)
-        jy = None
-else:
-    print('')
-    print('File name error: function limited to plotting ascii files output by queryDB.py.')
-    print('')
-    sys.exit()
-
-# If provided, read in the spectroscopic data:
-if argopt.spec != '':
-    specFiles = argopt.spec.split(',')
-    if argopt.specScale != '':
-        specS = [float(s) for s in argopt.specScale.split(',')]
-    else:
-        specS = [1]*len(specFiles)
-else:
-    specFiles = None
-    specS = None
-
-############
-# 2. Convert photometry data to W/m^2 (lamFlam): 
-############
-if jy:
-    for i in range(0, len(jy)):
-        if ejy[i] == '--':
-            ejy[i] = np.nan
-        else:
-            ejy[i] = float(ejy[i])
-    
-        if unit[i] == 'mag':
-            jy[i], ejy[i] = magToJy(jy[i],ejy[i], wband[i])
-            unit[i] = 'Jy'
-        elif unit[i] == 'mJy':
-            jy[i] = jy[i]*1e-3
-            ejy[i] = ejy[i]*1e-3
-            unit[i] = 'Jy'
-    
-    f, ef = [], []
-    for i in range(0, len(wvlen)):
-        f.append(JyToLamFlam(jy[i],ejy[i],wvlen[i])[0])
-        ef.append(JyToLamFlam(jy[i],ejy[i],wvlen[i])[1])
-
-
-############
-# 5. Plot SED:
-############
-if argopt.plt_range != '[]':
-    try:
-        x_range = argopt.plt_range.split(',')
-    except:
-        print('Error: format of plot limits not recognised')
-        print('Defaults will be used instead')
-        x_range = 'default'
-else:
-    x_range = 'default'
-
-if argopt.saveplt == True:
-    pltSED(infile, x_range, f, ef, wvlen, specFiles, specS, interactive=False)
-    sedOutF = infile.parent / Path(infile.name.split('_')[0]+'_sed.pdf')
+def savePlt(infile, x_range, phot, specFiles=None, specS=None, specNpz=False, tag='sed'):
+    """
+    Function to save a .pdf copy of the SED plot (to the 
+    directory of infile, named <obj>_<tag>_N.pdf so as to
+    avoid over-writing existing files). Returns the file name.
+    """
+    import matplotlib.pyplot as plt
+    from plot import pltSED
+    wvlen,wband,f,ef,flag,beam,odate,ref = phot
+    pltSED(infile, x_range, f, ef, wvlen, specFiles, specS, interactive=False,
+           specNpz=specNpz)
+    sedOutF = infile.parent / Path(infile.name.split('_')[0]+'_'+tag+'.pdf')
     k = 0
-    while (sedOutF.parent / Path(sedOutF.name.replace('sed.pdf', 'sed_'+str(k)+'.pdf'))).exists():
+    while (sedOutF.parent / Path(sedOutF.name.replace(tag+'.pdf', tag+'_'+str(k)+'.pdf'))).exists():
         k += 1 # avoids over-writing existing files
-    sedOutF = sedOutF.parent / Path(sedOutF.name.replace('sed.pdf', 'sed_'+str(k)+'.pdf'))
+    sedOutF = sedOutF.parent / Path(sedOutF.name.replace(tag+'.pdf', tag+'_'+str(k)+'.pdf'))
     plt.savefig(sedOutF)
+    plt.close(1)
+    return sedOutF
+
+def inspect_sed(infile, specFiles=None, specS=None, x_range='default', saveplt=False, 
+                specNpz=False):
+    """
+    Function to plot the SED for the photometry file infile
+    (as output by queryDB.py or inspectSED.py) so that spurious
+    data points may be selected, and write the retained points 
+    to a new _phot_cleaned_N.dat file.
+    - specFiles and specS are the spectra to overplot and the
+      scale factors to apply to them.
+    - saveplt=True saves .pdf copies of the full and cleaned SEDs
+    Returns the name of the cleaned file (None if no file was 
+    written).
+    """
+    import matplotlib.pyplot as plt
+    from plot import pltSED, fixaxis, SEDSelector
+    infile = Path(infile)
+    phot = convert_sed(infile)
+    wvlen,wband,f,ef,flag,beam,odate,ref = phot
     
-print('')
-print('-----------------------------------------------')
-print('| The plot displays your input SED data.      |')
-print('|                                             |')
-if argopt.saveplt == True:
-    print('| A copy of this plot has been saved to       |')
-    print('| '+str(sedOutF))
-    print('|                                             |')
-print('| Please click on any photometry points you   |')
-print('| wish to remove from the final data set.     |')
-print('|                                             |')
-print('| The x and y positions, together with the    |')
-print('| waveband of each data point you click will  |')
-print('| be printed to the terminal screen.          |')
-print('|                                             |')
-print('| When you are finished, please close the     |')
-print('| plot window.                                |')
-print('-----------------------------------------------')
-fig = pltSED(infile, x_range, f, ef, wvlen, specFiles, specS, interactive=True)
-
-indices = []
-
-def on_pick(event):
-    global indices
-    artist = event.artist
-    xmouse, ymouse = event.mouseevent.xdata, event.mouseevent.ydata
-    x, y = artist.get_xdata(), artist.get_ydata()
-    ind = event.ind
-    indices.append(ind[0])
-    print('')
-    print('Detected mouse click at:')
-    print('x=', x[ind[0]], 'm; y=', y[ind[0]], 'W/m^2')
-    print('Corresponding to waveband:',wband[ind[0]])
+    if saveplt == True:
+        sedOutF = savePlt(infile, x_range, phot, specFiles, specS, specNpz)
+        
     print('')
+    print('-----------------------------------------------')
+    print('| The plot displays your input SED data.      |')
+    print('|                                             |')
+    if saveplt == True:
+        print('| A copy of this plot has been saved to       |')
+        print('| '+str(sedOutF))
+        print('|                                             |')
+    print('| Please click on any photometry points you   |')
+    print('| wish to remove from the final data set.     |')
+    print('| Clicking a selected point de-selects it.    |')
+    print('|                                             |')
+    print('| To select many points at once, press b (or  |')
+    print('| l) and drag a box (or lasso) around them.   |')
+    print('| Press c to return to selecting by clicking. |')
+    print('|                                             |')
+    print('| The x and y positions, together with the    |')
+    print('| waveband of each data point you select will |')
+    print('| be printed to the terminal screen.          |')
+    print('|                                             |')
+    print('| When you are finished, please close the     |')
+    print('| plot window.                                |')
+    print('-----------------------------------------------')
+    fig = pltSED(infile, x_range, f, ef, wvlen, specFiles, specS, interactive=True,
+                 specNpz=specNpz)
+    
+    # positions of the photometry points as plotted (see plot.drawSED):
+    y_plt = fixaxis(f,ef,[0]*len(f))[0]
+    selector = SEDSelector(fig.axes[0], [w*1e6 for w in wvlen], y_plt, wband)
+    
+    plt.show()
+    
+    indices = sorted(selector.selected)
+    
+    # Write retained photometric data to file:
+    outfile = None
+    if 'cleaned' not in infile.name or indices != []:
+        print('')
+        print('Writing cleaned data to new file:')
+        outfile = write_cleaned(infile, phot, indices)
+        print(outfile) # name of file written
+        print('')
+    
+    # Save cleaned version of SED plot to file
+    if saveplt == True and indices != []:
+        sedOutF = savePlt(infile, x_range, read_cleaned(outfile), specFiles, specS, specNpz,
+                          tag='sed_cleaned')
+        print('')
+        print('Info: Plot of cleaned SED saved to '+str(sedOutF))
+        print('')
+    
+    return outfile
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=description,epilog=epilog,
+             formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phot",dest="phot",default='',type=str,
+                        help='Full path to photometry data file.')
+    parser.add_argument("--spec",dest='spec',default='',type=str,
+                        help='Full path to the Spitzer spectrum file.')
+    parser.add_argument("--scale",dest='specScale',default='',type=str,
+                        help='Scale factor to be applied to spectral flux')
+    parser.add_argument("--pltR",dest='plt_range',default='[]',type=str,
+                        help='X-range (in microns) for plot window (free by default)')
+    parser.add_argument("--savePlt",dest='saveplt',default=False,type=bool,
+                        help='Save a .pdf copy of the full and cleaned SEDs (default False)')
+    parser.add_argument("--spec-npz",dest='specNpz',action='store_true',
+                        help='Keep a .npz copy of each converted spectrum next to its fits file, for faster re-reading')
+    parser.add_argument("--rules",dest='rules',default='',type=str,
+                        help='Clean the photometry without plotting, using the rules in this json file')
+    parser.add_argument("--workers",dest='workers',default=1,type=int,
+                        help='Number of files cleaned in parallel with --rules (default 1)')
+
+    argopt = parser.parse_args()
 
-plt.connect('pick_event', on_pick)
+    if argopt.specScale != '':
+        if len(argopt.specScale.split(',')) != len(argopt.spec.split(',')):
+            print('Error: options parsed to --spec and to --scale ')
+            print('must have the same length!')
+            sys.exit()
+
+    ############
+    # Non-interactive cleaning of one or more files (or directories) using rules:
+    ############
+    if argopt.rules != '':
+        phots = [p.strip() for p in argopt.phot.split(',') if p.strip() != '']
+        if phots == []:
+            print('')
+            print('Error: --rules requires the photometry files (or directories) to clean')
+            print('to be given with --phot.')
+            print('')
+            sys.exit()
+        from cleaning import read_rules, phot_files, clean_files
+        rules = read_rules(argopt.rules)
+        files = phot_files(phots)
+        for infile, result, err in clean_files(files, rules, argopt.workers):
+            if err is not None:
+                print('Warning: could not clean '+str(infile)+': '+err)
+                continue
+            outfile, removed = result
+            print(str(outfile)+': removed '+', '.join([str(removed[r])+' ('+r+')' for r in removed]))
+        sys.exit()
 
-plt.show()
+    infile = Path(argopt.phot)
+    if infile.suffix != '.dat':
+        print('')
+        print('File name error: function limited to plotting ascii files output by queryDB.py.')
+        print('')
+        sys.exit()
 
-############
-# 5. Write retained photometric data to file:
-############
-if 'cleaned' not in infile.name or indices != []:
-    print('')
-    print('Writing cleaned data to new file:')
-    if 'cleaned' not in infile.name:
-        outfile = infile.parent / Path(infile.stem+'_cleaned_')
+    # If provided, read in the spectroscopic data:
+    if argopt.spec != '':
+        specFiles = argopt.spec.split(',')
+        if argopt.specScale != '':
+            specS = [float(s) for s in argopt.specScale.split(',')]
+        else:
+            specS = [1]*len(specFiles)
     else:
-        outfile = infile.parent / Path(infile.stem)
-    j = 0
-    while Path(str(outfile)+str(j)+'.dat').exists():
-        j += 1 # avoids over-writing other attempts to clean data file
-    
-    outfile = Path(str(outfile)+str(j)+'.dat')
-    print(outfile) # name of file to be written
-    print('')
-    with open(outfile,'w') as f_out:
-        with open(infile, 'r') as f_in:
-            for line in f_in:
-                try:
-                    a = float(line[0])
-                except ValueError:
-                    f_out.write(line.replace('mag','lamFlam').replace('m -- -- --','m -- W/m^2 W/m^2'))
-        for i in range(0, len(wvlen)):
-            if i not in indices:
-                f_out.write(' '.join([str(x) for x in [wvlen[i], # wavelength in m
-                                                       wband[i], # waveband 
-                                                       f[i],     # flux in W/m^2
-                                                       ef[i],    # flux error in W/m^2
-                                                       flag[i],  # flag on flux
-                                                       beam[i],  # beam size (may be dummy value)
-                                                       odate[i], # obs date (may be unknown or average)
-                                                       ref[i]]])+'\n') # reference for original data
-
-############
-# 6. Save cleaned version of SED plot to file
-############
-if argopt.saveplt == True and indices != []:
-    # read in cleaned data:
-    wvlen,wband,f,ef,flag,beam,odate,ref = read_cleaned(outfile)
-    
-    pltSED(infile, x_range, f, ef, wvlen, specFiles, specS, interactive=False)
-    h = 0
-    while (sedOutF.parent / Path(sedOutF.name.replace('sed_'+str(k)+'.pdf', 'sed_cleaned_'+str(h)+'.pdf'))).exists():
-        h += 1 # avoids over-writing existing files
-    sedOutF = sedOutF.parent / Path(sedOutF.name.replace('sed_'+str(k)+'.pdf', 'sed_cleaned_'+str(h)+'.pdf'))
-    plt.savefig(sedOutF)
-    print('')
-    print('Info: Plot of cleaned SED saved to '+str(sedOutF))
-    print('')
+        specFiles = None
+        specS = None
+
+    if argopt.plt_range != '[]':
+        try:
+            x_range = argopt.plt_range.split(',')
+        except:
+            print('Error: format of plot limits not recognised')
+            print('Defaults will be used instead')
+            x_range = 'default'
+    else:
+        x_range = 'default'
 
+    inspect_sed(infile, specFiles, specS, x_range, argopt.saveplt, argopt.specNpz)
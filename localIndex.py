@@ -0,0 +1,254 @@
+import os
+import csv
+import json
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+def parentName(target):
+    """
+    Name of the parent star of a (potential) binary component
+    i.e. the portion of the name up to the final space.
+    """
+    return ' '.join(target.split(' ')[:-1])
+
+def fileHash(path):
+    """
+    sha1 hash of the contents of the file at path.
+    """
+    with open(path, 'rb') as f_in:
+        return hashlib.sha1(f_in.read()).hexdigest()
+
+class LocalIndex:
+    """
+    Persistent inverted index of the target names in the local
+    database tables. For each catalog key in ldbN (as returned
+    by src_localDB) the index maps every target name, and the
+    name of its parent star, to the byte offsets of the matching
+    rows of the csv file so that only those rows need to be read.
+
+    The index is saved to indexFile (default:
+    database/.sedbys_index.json in the local database trunk) and
+    the entry for a table is only rebuilt when its file has changed
+    (i.e. when its modification time and sha1 hash differ from
+    those recorded in the index).
+    """
+    def __init__(self, ldbN, indexFile=None):
+        self.ldbN = ldbN
+        if indexFile is None and len(ldbN) != 0:
+            indexFile = Path(ldbN[list(ldbN)[0]]).parent / '.sedbys_index.json'
+        self.indexFile = indexFile
+        self.files = {}
+        if indexFile is not None and Path(indexFile).exists():
+            try:
+                with open(indexFile) as f_in:
+                    self.files = json.load(f_in)['files']
+            except (ValueError, KeyError):
+                self.files = {}
+
+        changed = False
+        for o in ldbN:
+            if self.refresh(o):
+                changed = True
+        self.names, self.parents = {}, {}
+        for o in self.files:
+            for t, rows in self.files[o]['targets'].items():
+                self.names.setdefault(t, {})[o] = rows
+                self.parents.setdefault(parentName(t), {}).setdefault(o, []).append(t)
+        if changed and indexFile is not None:
+            self.save()
+
+    def refresh(self, o):
+        """
+        Re-index the table for catalog key o if its file has
+        changed since it was last indexed. Returns True if the
+        index entry was updated.
+        """
+        path = Path(self.ldbN[o])
+        st = path.stat()
+        entry = self.files.get(o)
+        if entry is not None and entry['path'] == str(path):
+            if entry['mtime'] == st.st_mtime and entry['size'] == st.st_size:
+                return False
+            sha = fileHash(path)
+            if entry['sha1'] == sha:
+                entry['mtime'], entry['size'] = st.st_mtime, st.st_size
+                return True
+        else:
+            sha = fileHash(path)
+
+        targets = {}
+        with open(path, 'rb') as f_in:
+            header = next(csv.reader([f_in.readline().decode('utf-8')]))
+            offset = f_in.tell()
+            for line in iter(f_in.readline, b''):
+                row = next(csv.reader([line.decode('utf-8')]), [])
+                if len(row) != 0 and row[0] != '':
+                    targets.setdefault(row[0], []).append(offset)
+                offset = f_in.tell()
+        self.files[o] = {'path' : str(path), 'mtime' : st.st_mtime, 'size' : st.st_size,
+                         'sha1' : sha, 'header' : header, 'targets' : targets}
+        return True
+
+    def save(self):
+        """
+        Write the index to file (via a temporary file so that
+        concurrent readers never see a partial index).
+        """
+        tmpF = Path(str(self.indexFile)+'.'+str(os.getpid())+'.tmp')
+        try:
+            with open(tmpF, 'w') as f_out:
+                json.dump({'files' : self.files}, f_out)
+            tmpF.replace(self.indexFile)
+        except OSError:
+            # e.g. read-only local database: the in-memory index is still used
+            if tmpF.exists():
+                tmpF.unlink()
+
+    def rows(self, o, offsets):
+        """
+        Read the rows at the given byte offsets from the table for
+        catalog key o. Each row is returned as a dictionary keyed
+        on column name (as for csv.DictReader).
+        """
+        header = self.files[o]['header']
+        out = []
+        with open(self.ldbN[o], 'rb') as f_in:
+            for off in offsets:
+                f_in.seek(off)
+                row = next(csv.reader([f_in.readline().decode('utf-8')]))
+                out.append(dict(zip(header, row)))
+        return out
+
+    def find(self, o, names):
+        """
+        Find the entries in the table for catalog key o for the
+        first of the target names (e.g. SIMBAD aliases) in names
+        that appears in the table. Returns the matched name and
+        the list of matching rows, or (None, []) if no match.
+        """
+        for n in names:
+            if o in self.names.get(n, {}):
+                return n, self.rows(o, self.names[n][o])
+        return None, []
+
+    def findComponents(self, o, names):
+        """
+        Find the target names in the table for catalog key o that
+        are individual components of the first of names to appear
+        in the table as a parent star name.
+        """
+        for n in names:
+            if o in self.parents.get(n, {}):
+                return [t for t in self.parents[n][o] for r in self.names[t][o]]
+        return []
+
+
+def metaHash(ldb, o):
+    """
+    sha1 hash of the metadata for catalog key o in ldb (the
+    tuple of dictionaries returned by src_localDB).
+    """
+    meta = json.dumps([str(ldb[0][o])]+[ldb[i][o] for i in range(1, 8)])
+    return hashlib.sha1(meta.encode('utf-8')).hexdigest()
+
+class CompiledDB:
+    """
+    Read access to the compiled (SQLite) version of the local
+    database written by buildDB.compileDB. Rows are returned in
+    the same form as those of LocalIndex (but with typed flux
+    and error values) so that the two may be used
+    interchangeably.
+    - ldb is the tuple of dictionaries returned by src_localDB,
+      used to decide whether the compiled entry for a catalog is
+      up to date with its csv file and catalog metadata.
+    The connection may be shared between threads (e.g. by the
+    sedbys.py service); queries are serialised with a lock.
+    """
+    def __init__(self, dbFile, ldb):
+        self.ldb = ldb
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect('file:'+str(dbFile)+'?mode=ro', uri=True,
+                                  check_same_thread=False)
+        self.sources = {r[0] : r[1:] for r in 
+                        self.db.execute('SELECT catalog, path, mtime, size, sha1, meta FROM catalogs')}
+
+    def fresh(self, o):
+        """
+        True if the compiled entry for catalog key o is up to date.
+        """
+        if o not in self.sources:
+            return False
+        path, mtime, size, sha, meta = self.sources[o]
+        fpath = Path(self.ldb[0][o])
+        if path != str(fpath) or meta != metaHash(self.ldb, o):
+            return False
+        st = fpath.stat()
+        if st.st_mtime == mtime and st.st_size == size:
+            return True
+        return st.st_size == size and fileHash(fpath) == sha
+
+    def _rows(self, o, where, value):
+        # the typed flux and error are used as read, falling back to the
+        # text entry only for non-numeric values (e.g. '--'):
+        rows = {}
+        with self._lock:
+            found = self.db.execute(
+                'SELECT row, fcol, ecol, IFNULL(flux, flux_txt), IFNULL(eflux, eflux_txt), '
+                'obsdate FROM phot WHERE '+where+'=? AND catalog=? ORDER BY row, col', 
+                (value, o)).fetchall()
+        for r, fcol, ecol, flux, eflux, odate in found:
+            entry = rows.setdefault(r, {'ObsDate' : odate})
+            entry[fcol], entry[ecol] = flux, eflux
+        return [rows[r] for r in sorted(rows)]
+
+    def find(self, o, names):
+        """
+        As LocalIndex.find.
+        """
+        for n in names:
+            entries = self._rows(o, 'target', n)
+            if len(entries) != 0:
+                return n, entries
+        return None, []
+
+    def findComponents(self, o, names):
+        """
+        As LocalIndex.findComponents.
+        """
+        for n in names:
+            with self._lock:
+                targs = [r[1] for r in self.db.execute('SELECT DISTINCT row, target FROM phot '
+                                                       'WHERE parent=? AND catalog=? ORDER BY row', 
+                                                       (n, o)).fetchall()]
+            if len(targs) != 0:
+                return targs
+        return []
+
+def openLocalDB(ldb, dbFile=None):
+    """
+    Choose how each table in the local database is searched:
+    using the compiled database in dbFile (see buildDB.compileDB)
+    where it is up to date, or else the index of the csv file.
+    Returns a dictionary mapping catalog key to a CompiledDB or
+    LocalIndex object.
+    - ldb is the tuple of dictionaries returned by src_localDB
+    """
+    ldbN = ldb[0]
+    comp = None
+    if dbFile is not None and Path(dbFile).exists():
+        try:
+            comp = CompiledDB(dbFile, ldb)
+        except sqlite3.Error:
+            comp = None
+    
+    lookup = {}
+    if comp is not None:
+        lookup = {o : comp for o in ldbN if comp.fresh(o)}
+    stale = {o : ldbN[o] for o in ldbN if o not in lookup}
+    if len(stale) != 0:
+        index = LocalIndex(stale)
+        for o in stale:
+            lookup[o] = index
+    return lookup
@@ -1,6 +1,10 @@
 from numpy import ndarray, where, array, zeros, ones, float64
-import matplotlib.pyplot as plt
-from sed_input import read_spectrum
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.widgets import RectangleSelector, LassoSelector
+from matplotlib.path import Path as mplPath
+from sed_input import load_spectrum, convert_sed
 import warnings
 from pathlib import Path
 
@@ -61,26 +65,104 @@ def fixaxis(data,err,lolims):
         
         return data,newerr.T,lolims
 
-def pltSED(infile, x_range, f, ef, wvlen, specFiles=None, specS=None, interactive=False):
+def decimate(x, y, lo, hi, nbins):
     """
-    Function to plot spectral energy distribution in log-log
-    space.
+    Level-of-detail reduction of a spectrum for plotting.
+    The (sorted) wavelengths x are split into nbins bins of 
+    equal width in log(x) and, for each bin, only the points 
+    with the minimum and maximum flux y are kept, so that 
+    peaks and troughs survive however many points are 
+    dropped. lo and hi (the lower and upper edges of the error
+    band) are replaced by their minimum and maximum in each 
+    bin. Spectra with no more than 2*nbins points are returned
+    unchanged.
+    """
+    x, y, lo, hi = [np.asarray(a, dtype=float) for a in (x, y, lo, hi)]
+    keep = np.isfinite(x) & np.isfinite(y) & (x > 0)
+    x, y, lo, hi = x[keep], y[keep], lo[keep], hi[keep]
+    if np.any(np.diff(x) < 0):
+        order = np.argsort(x, kind='stable')
+        x, y, lo, hi = x[order], y[order], lo[order], hi[order]
+    if len(x) <= 2*nbins:
+        return x, y, lo, hi
+    
+    logx = np.log10(x)
+    edges = np.linspace(logx[0], logx[-1], nbins+1)
+    b = np.clip(np.searchsorted(edges, logx, side='right')-1, 0, nbins-1)
+    starts = np.flatnonzero(np.r_[True, b[1:] != b[:-1]])
+    # within each bin, order by flux: the first and last point are the min and max
+    order = np.lexsort((y, b))
+    ends = np.r_[starts[1:], len(x)]-1
+    pick = np.sort(np.unique(np.concatenate([order[starts], order[ends]])))
+    
+    bandLo = np.fmin.reduceat(lo, starts)
+    bandHi = np.fmax.reduceat(hi, starts)
+    inBin = np.searchsorted(starts, pick, side='right')-1
+    return x[pick], y[pick], bandLo[inBin], bandHi[inBin]
+
+def pltSpectrum(ax1, x, y, lo, hi, colS, nbins=None):
+    """
+    Function to plot a spectrum (wavelength x, flux y and
+    error band lo to hi) as a line with a shaded error band
+    rather than as individual errorbars. The spectrum is
+    reduced to the level of detail the axes can show (see
+    decimate): nbins defaults to the width of ax1 in pixels.
+    Whenever the x-axis limits change (e.g. when zooming in
+    on an interactive plot) the visible part of the spectrum
+    is decimated again, so redraws are fast however long 
+    the spectrum.
+    """
+    x, y, lo, hi = [np.asarray(a, dtype=float) for a in (x, y, lo, hi)]
+    if nbins is None:
+        nbins = max(int(ax1.get_window_extent().width), 100)
+    
+    def visible(ax):
+        # index range of the points within (or adjacent to) the x-axis limits
+        if ax.get_autoscalex_on():
+            return 0, len(x)
+        xmin, xmax = sorted(ax.get_xlim())
+        return (max(np.searchsorted(x, xmin)-1, 0), 
+                min(np.searchsorted(x, xmax, side='right')+1, len(x)))
+    
+    shown = {'range' : visible(ax1)}
+    xd, yd, lod, hid = decimate(*[a[slice(*shown['range'])] for a in (x, y, lo, hi)], nbins)
+    line, = ax1.plot(xd, yd, color=colS, ls='-', lw=1)
+    shown['band'] = ax1.fill_between(xd, lod, hid, color=colS, alpha=0.3, lw=0)
+    
+    def update(ax):
+        rng = visible(ax)
+        if rng == shown['range']:
+            return
+        shown['range'] = rng
+        xd, yd, lod, hid = decimate(*[a[slice(*rng)] for a in (x, y, lo, hi)], nbins)
+        line.set_data(xd, yd)
+        shown['band'].remove()
+        shown['band'] = ax.fill_between(xd, lod, hid, color=colS, alpha=0.3, lw=0)
+    
+    ax1.callbacks.connect('xlim_changed', update)
+    return line
+
+def drawSED(ax1, title, x_range, f, ef, wvlen, specFiles=None, specS=None, specNpz=False):
+    """
+    Function to draw spectral energy distribution in log-log
+    space onto the matplotlib Axes object ax1.
     - specS is a vertical scaling to apply to the spectral
       flux information.
+    - spectra are only read once per session (see 
+      sed_input.load_spectrum); specNpz=True also keeps a
+      .npz copy of each spectrum for later sessions.
     """
-    fig1 = plt.figure(1, figsize=(6., 4.))
-    ax1 = plt.subplot2grid((1,1), (0,0))
     ax1.set_xlabel("${\lambda}$ [${\mu}m$]")
     ax1.set_ylabel("${\lambda}\,F_{\lambda}$ [W m$^{-2}$]")
-    ax1.set_title(infile.name.split('_')[0])
+    ax1.set_title(title)
     if x_range != 'default':
         ax1.set_xlim(float(x_range[0]), float(x_range[1]))
     if specFiles:
         for sF in range(0, len(specFiles)):
-            wave_s, flux_s, eflux_s, colS = read_spectrum(Path(specFiles[sF]))
+            wave_s, flux_s, eflux_s, colS = load_spectrum(Path(specFiles[sF]), specS[sF], specNpz)
             x1,xerr1,xlolims1=fixaxis(wave_s,None,False)
-            y1,yerr1,uplims1=fixaxis([fx*specS[sF] for fx in flux_s],[fx*specS[sF] for fx in eflux_s],False)
-            ax1.errorbar(x1,y1,yerr1,xerr1,color=colS,ms=5,ls='-')
+            y1,yerr1,uplims1=fixaxis(flux_s,eflux_s,False)
+            pltSpectrum(ax1,x1,y1,y1-yerr1[0],y1+yerr1[1],colS)
 
     
     ax1.loglog()
@@ -93,10 +175,183 @@ def pltSED(infile, x_range, f, ef, wvlen, specFiles=None, specS=None, interactiv
     
     x,xerr,xlolims=fixaxis([w*1e6 for w in wvlen],None,False)
     y,yerr,uplims=fixaxis(f,ef,yuplim) # convert flux and its error to log space
+    ax1.errorbar(x,y,yerr,xerr,uplims=uplims,xlolims=xlolims,color='k',marker='o',ms=5,
+                 ls='none')
+    return ax1
+
+def pltSED(infile, x_range, f, ef, wvlen, specFiles=None, specS=None, interactive=False,
+           specNpz=False):
+    """
+    Function to plot spectral energy distribution in log-log
+    space.
+    - specS is a vertical scaling to apply to the spectral
+      flux information.
+    - interactive=True returns the figure (for use with
+      SEDSelector).
+    """
+    import matplotlib.pyplot as plt # only for interactive use (see renderSED)
+    fig1 = plt.figure(1, figsize=(6., 4.))
+    ax1 = plt.subplot2grid((1,1), (0,0))
+    drawSED(ax1, infile.name.split('_')[0], x_range, f, ef, wvlen, specFiles, specS,
+            specNpz=specNpz)
     if interactive == True:
-        ax1.errorbar(x,y,yerr,xerr,uplims=uplims,xlolims=xlolims,color='k',marker='o',ms=5,
-                     ls='none',picker=2)
         return fig1
-    else:
-        ax1.errorbar(x,y,yerr,xerr,uplims=uplims,xlolims=xlolims,color='k',marker='o',ms=5,
-                     ls='none')
+
+class SEDSelector:
+    """
+    Interactive selection of the photometry points (x, y; in
+    data coordinates) plotted on the Axes ax, e.g. to flag them
+    for removal. Selected points are highlighted and their
+    indices kept, in order of selection, in self.selected.
+    - click: select the point nearest the cursor (within tol 
+      pixels), or de-select it if already selected. Clicks are
+      resolved using a KD-tree of the point positions in display
+      space, built once per view (i.e. rebuilt only after the 
+      plot is zoomed, panned or resized).
+    - press 'b' / 'l' to select all points within a dragged box
+      / lasso, and 'c' to return to selecting by clicking.
+    - labels (e.g. waveband names) are printed for each point
+      (de-)selected.
+    Highlights are drawn by blitting, so the plot is not redrawn
+    in full for each selection.
+    """
+    def __init__(self, ax, x, y, labels=None, tol=5):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.xy = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+        self.labels = labels
+        self.tol = tol
+        self.selected = []
+        self.mode = 'click'
+        self._tree, self._treeKey, self._background = None, None, None
+        self.highlight, = ax.plot([], [], ls='none', marker='o', ms=10, mfc='none',
+                                  mec='r', mew=2, animated=True)
+        self.box = RectangleSelector(ax, self._on_box, useblit=True, button=[1])
+        self.lasso = LassoSelector(ax, self._on_lasso, useblit=True, button=[1])
+        self.box.set_active(False)
+        self.lasso.set_active(False)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('button_press_event', self._on_click)
+        self.canvas.mpl_connect('key_press_event', self._on_key)
+
+    def tree(self):
+        """
+        KD-tree of the (finite) point positions in display space
+        for the current view, and the indices of those points.
+        """
+        key = (self.ax.get_xlim(), self.ax.get_ylim(), tuple(self.ax.bbox.bounds))
+        if self._tree is None or key != self._treeKey:
+            pix = self.ax.transData.transform(self.xy)
+            self._valid = np.flatnonzero(np.all(np.isfinite(pix), axis=1))
+            from scipy.spatial import cKDTree # only needed for interactive plots
+            self._tree = cKDTree(pix[self._valid])
+            self._treeKey = key
+        return self._tree, self._valid
+
+    def nearest(self, px, py):
+        """
+        Index of the point nearest the display position px, py
+        (None if there is no point within tol pixels).
+        """
+        tree, valid = self.tree()
+        if len(valid) == 0:
+            return None
+        d, i = tree.query([px, py], distance_upper_bound=self.tol)
+        if i == len(valid):
+            return None
+        return int(valid[i])
+
+    def report(self, ind, action):
+        print('')
+        print(action+' data point at:')
+        print('x=', self.xy[ind, 0], 'um; y=', self.xy[ind, 1], 'W/m^2')
+        if self.labels is not None:
+            print('Corresponding to waveband:', self.labels[ind])
+        print('')
+
+    def select(self, inds):
+        new = [int(i) for i in inds if int(i) not in self.selected]
+        for i in new:
+            self.selected.append(i)
+            self.report(i, 'Selected')
+        if len(new) != 0:
+            self.update()
+
+    def toggle(self, ind):
+        if ind in self.selected:
+            self.selected.remove(ind)
+            self.report(ind, 'De-selected')
+            self.update()
+        else:
+            self.select([ind])
+
+    def update(self):
+        """
+        Redraw the highlighted points (by blitting where possible).
+        """
+        self.highlight.set_data(self.xy[self.selected, 0], self.xy[self.selected, 1])
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self.ax.draw_artist(self.highlight)
+        self.canvas.blit(self.ax.bbox)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.highlight)
+
+    def _on_click(self, event):
+        toolbar = getattr(self.canvas, 'toolbar', None)
+        if (self.mode != 'click' or event.inaxes != self.ax or event.button != 1 or
+            (toolbar is not None and str(toolbar.mode) != '')):
+            return # ignore clicks used for zooming/panning or box/lasso selection
+        ind = self.nearest(event.x, event.y)
+        if ind is not None:
+            self.toggle(ind)
+
+    def _on_key(self, event):
+        modes = {'b' : 'box', 'l' : 'lasso', 'c' : 'click'}
+        if event.key not in modes:
+            return
+        self.mode = modes[event.key]
+        self.box.set_active(self.mode == 'box')
+        self.lasso.set_active(self.mode == 'lasso')
+        print('Selection mode: '+self.mode)
+
+    def _on_box(self, eclick, erelease):
+        x0, x1 = sorted([eclick.xdata, erelease.xdata])
+        y0, y1 = sorted([eclick.ydata, erelease.ydata])
+        inside = ((self.xy[:, 0] >= x0) & (self.xy[:, 0] <= x1) & 
+                  (self.xy[:, 1] >= y0) & (self.xy[:, 1] <= y1))
+        self.select(np.flatnonzero(inside))
+
+    def _on_lasso(self, verts):
+        # test containment in display space (the axes are logarithmic):
+        lasso = mplPath(self.ax.transData.transform(verts))
+        inside = lasso.contains_points(self.ax.transData.transform(self.xy))
+        self.select(np.flatnonzero(inside))
+
+def renderSED(infile, outFiles, specFiles=None, specS=None, x_range='default', 
+              figsize=(6., 4.), dpi=150, specNpz=False, fmt=None):
+    """
+    Function to render the SED for the photometry file infile
+    (as output by queryDB.py or inspectSED.py) to each of
+    outFiles (the format is set by the file extension, e.g.
+    .pdf or .png, or fmt if given, e.g. when outFiles are 
+    file objects) without using pyplot, i.e. on its own 
+    Figure with the Agg canvas, so that it may run headless 
+    and in parallel with other renders.
+    """
+    wvlen,wband,f,ef,flag,beam,odate,ref = convert_sed(infile)
+    if specFiles and not specS:
+        specS = [1]*len(specFiles)
+    
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax1 = fig.add_subplot(1, 1, 1)
+    drawSED(ax1, Path(infile).name.split('_')[0], x_range, f, ef, wvlen, specFiles, specS,
+            specNpz=specNpz)
+    for outF in outFiles:
+        fig.savefig(outF, dpi=dpi, format=fmt)
+    return outFiles
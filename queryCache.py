@@ -0,0 +1,136 @@
+import os
+import time
+import json
+import pickle
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+def default_cache_dir():
+    """
+    Default location of the SEDBYS query cache. This may be
+    over-ridden using environment variable $SEDBYS_CACHE.
+    """
+    if os.getenv('SEDBYS_CACHE'):
+        return Path(os.getenv('SEDBYS_CACHE'))
+    return Path.home() / '.cache' / 'sedbys'
+
+class QueryCache:
+    """
+    Persistent, content-addressed store of responses from
+    the online services queried by SEDBYS (SIMBAD, VizieR).
+
+    Each response is pickled and saved to an SQLite database
+    in cacheDir under a key built from the service name and
+    the query parameters (e.g. catalog ID, object name and
+    search radius).
+    - ttl is the time (in seconds) after which an entry is
+      considered out of date and is fetched again.
+    - maxSize is the maximum total size (in bytes) of the
+      stored responses. Once exceeded, the least recently
+      used entries are removed.
+    - refresh=True ignores existing entries (the fresh
+      responses are still saved).
+    - replay=True serves only the stored responses, whatever
+      their age, and raises ConnectionError for any query not
+      stored rather than contacting the service (e.g. to run
+      offline, or to test against previously recorded responses).
+    - record=True keeps a list (recorded) of every response
+      received from the services, as (service, params, response),
+      e.g. to save them for later replay. Use with refresh=True
+      so that every response is a live one.
+    """
+    def __init__(self, cacheDir=None, ttl=30*86400, maxSize=500*1024**2, refresh=False,
+                 replay=False, record=False):
+        if cacheDir is None or str(cacheDir) == '':
+            cacheDir = default_cache_dir()
+        self.cacheDir = Path(cacheDir).expanduser()
+        Path.mkdir(self.cacheDir, parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.maxSize = maxSize
+        self.refresh = refresh
+        self.replay = replay
+        self.record = record
+        self.recorded = []
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.cacheDir / 'queries.sqlite'),
+                                   check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS entries ('
+                             'key TEXT PRIMARY KEY, service TEXT, created REAL, '
+                             'accessed REAL, size INTEGER, data BLOB)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS entries_accessed '
+                             'ON entries (accessed)')
+
+    @staticmethod
+    def key(service, params):
+        """
+        Build the cache key for a query to service with the
+        (json-serialisable) list of query parameters params.
+        """
+        blob = json.dumps([service]+[str(p) for p in params])
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Return (True, response) if an up-to-date entry exists
+        for key, otherwise (False, None).
+        """
+        if self.refresh:
+            return False, None
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT created, data FROM entries WHERE key=?',
+                                   (key,)).fetchone()
+            if row is None or (now-row[0] > self.ttl and not self.replay):
+                return False, None
+            with self._db:
+                self._db.execute('UPDATE entries SET accessed=? WHERE key=?', (now, key))
+        return True, pickle.loads(row[1])
+
+    def put(self, key, service, response):
+        """
+        Save response under key, then evict the least recently
+        used entries if the cache has grown beyond maxSize.
+        """
+        data = pickle.dumps(response, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO entries VALUES (?,?,?,?,?,?)',
+                             (key, service, now, now, len(data), sqlite3.Binary(data)))
+            total = self._db.execute('SELECT TOTAL(size) FROM entries').fetchone()[0]
+            if total > self.maxSize:
+                for k, size in self._db.execute('SELECT key, size FROM entries '
+                                                'ORDER BY accessed').fetchall():
+                    if total <= self.maxSize:
+                        break
+                    self._db.execute('DELETE FROM entries WHERE key=?', (k,))
+                    total -= size
+
+    def fetch(self, service, params, func):
+        """
+        Return the stored response for the query (service,
+        params) or, if there is none, call func() to retrieve
+        it and store the result. Exceptions raised by func are
+        not cached.
+        """
+        key = self.key(service, params)
+        found, response = self.get(key)
+        if not found and self.replay:
+            raise ConnectionError('no recorded '+service+' response for '+
+                                  ', '.join([str(p) for p in params]))
+        if not found:
+            response = func()
+            self.put(key, service, response)
+            if self.record:
+                with self._lock:
+                    self.recorded.append((service, [str(p) for p in params], response))
+        return response
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM entries')
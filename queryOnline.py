@@ -0,0 +1,279 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# astroquery (and astropy) are only imported once a query is
+# actually sent, so that responses served from the query cache
+# do not pay for loading them.
+
+# maximum number of rows returned by each VizieR cone search (-1 for no
+# limit), the same for single-object and batch queries so that both
+# return (and cache) the same result:
+VIZIER_ROW_LIMIT = -1
+
+def cachedQuery(cache, service, params, func):
+    """
+    Function to retrieve the response to a query from cache
+    (a queryCache.QueryCache object) where possible, calling
+    func() otherwise. If cache is None, func() is always called.
+    """
+    if cache is None:
+        return func()
+    return cache.fetch(service, params, func)
+
+def withRetry(func, retries=3, wait=1.):
+    """
+    Function to call func(), retrying up to retries times
+    (waiting wait, 2*wait, 4*wait... seconds in between) if
+    the connection fails or times out.
+    """
+    for attempt in range(0, retries+1):
+        try:
+            return func()
+        except OSError: # includes connection errors and timeouts
+            if attempt == retries:
+                raise
+            time.sleep(wait*2**attempt)
+
+def photSimbad():
+    """
+    Create custom SIMBAD (cS) query to retrieve 2MASS flux
+    (as well as the coordinates of each object).
+    """
+    from astroquery.simbad import Simbad
+    cS = Simbad()
+    cS.add_votable_fields('flux(J)', 'flux(H)', 'flux(K)')
+    cS.add_votable_fields('flux_error(J)', 'flux_error(H)', 'flux_error(K)')
+    cS.add_votable_fields('flux_bibcode(J)', 'flux_bibcode(H)', 'flux_bibcode(K)')
+    return cS
+
+def simbadPhot(obj, cache=None):
+    """
+    Function to retrieve the SIMBAD entry for obj, including
+    its coordinates and 2MASS photometry (flux, error and bibcode).
+    """
+    return cachedQuery(cache, 'simbad_phot', [obj], lambda: photSimbad().query_object(obj))
+
+def simbadPhotMulti(objs, cache=None):
+    """
+    Function to retrieve the SIMBAD entries (as for simbadPhot)
+    for a list of objects using a single SIMBAD query. A list
+    of entries is returned in the same order as objs, with None
+    for any object not recognised by SIMBAD.
+    - entries found in cache are not queried again and newly
+      retrieved entries are saved to cache individually (so that
+      they are also used by single-object queries).
+    """
+    out = {}
+    todo = []
+    for obj in objs:
+        if cache is not None:
+            found, res = cache.get(cache.key('simbad_phot', [obj]))
+            if found:
+                out[obj] = res
+                continue
+        if obj not in todo:
+            todo.append(obj)
+    
+    if len(todo) != 0:
+        result = photSimbad().query_objects(todo)
+        for t in range(0, len(todo)):
+            if not result:
+                res = None
+            elif 'SCRIPT_NUMBER_ID' in result.colnames:
+                # 1-based index into the list of queried objects
+                res = result[result['SCRIPT_NUMBER_ID'] == t+1]
+            else:
+                res = result[result['user_specified_id'] == todo[t]]
+            if res is not None and len(res) == 0:
+                res = None
+            if cache is not None:
+                cache.put(cache.key('simbad_phot', [todo[t]]), 'simbad_phot', res)
+            out[todo[t]] = res
+    
+    return [out[obj] for obj in objs]
+
+def simbadIDs(obj, cache=None):
+    """
+    Function to retrieve all SIMBAD identifiers for obj.
+    """
+    def query():
+        from astroquery.simbad import Simbad
+        return withRetry(lambda: Simbad.query_objectids(obj))
+    return cachedQuery(cache, 'simbad_ids', [obj], query)
+
+def simbadIDsMulti(objs, cache=None, chunk=500):
+    """
+    Function to retrieve all SIMBAD identifiers for each of
+    the names in objs using one SIMBAD TAP query (over the
+    ident table) per chunk names. Names not matched by the 
+    batched query are looked up individually (see simbadIDs),
+    as are all names if the installed astroquery does not
+    support TAP queries. Returns a dictionary of name: list 
+    of identifiers (empty if not recognised by SIMBAD).
+    - the number of rows returned by each query is capped at
+      the SIMBAD hard limit; a chunk whose output is truncated
+      is split and queried again.
+    - results are read from and saved to cache per name, as
+      for simbadIDs.
+    """
+    out = {}
+    todo = []
+    for obj in objs:
+        if cache is not None:
+            found, res = cache.get(cache.key('simbad_ids', [obj]))
+            if found:
+                out[obj] = [str(a[0]) for a in res] if res else []
+                continue
+        if obj not in todo:
+            todo.append(obj)
+    
+    tap = False
+    if len(todo) != 0:
+        from astroquery.simbad import Simbad
+        tap = hasattr(Simbad, 'query_tap')
+    if tap:
+        from astropy.table import Table
+        query = ('SELECT names.user_specified_id, ids.id FROM TAP_UPLOAD.names AS names '
+                 'JOIN ident AS id_typed ON id_typed.id = names.user_specified_id '
+                 'JOIN ident AS ids ON ids.oidref = id_typed.oidref')
+        def queryChunk(names):
+            # allow ~200 identifiers per name, within the limit set by the service
+            # (query_tap raises ValueError above it):
+            maxrec = min(len(names)*200, Simbad.hardlimit)
+            result = withRetry(lambda: Simbad.query_tap(query, maxrec=maxrec,
+                               names=Table({'user_specified_id' : names})))
+            if len(result) >= maxrec:
+                # the output was truncated: split the chunk (a single name is
+                # left to be looked up individually)
+                if len(names) == 1:
+                    return {}
+                found = queryChunk(names[:len(names)//2])
+                found.update(queryChunk(names[len(names)//2:]))
+                return found
+            found = {}
+            for row in result:
+                found.setdefault(str(row['user_specified_id']), []).append(str(row['id']))
+            return found
+        
+        for start in range(0, len(todo), chunk):
+            found = queryChunk(todo[start:start+chunk])
+            for obj in found:
+                if cache is not None:
+                    cache.put(cache.key('simbad_ids', [obj]), 'simbad_ids',
+                              Table({'id' : found[obj]}))
+                out[obj] = found[obj]
+    
+    for obj in todo:
+        if obj not in out:
+            res = simbadIDs(obj, cache)
+            out[obj] = [str(a[0]) for a in res] if res else []
+    
+    return {obj : out[obj] for obj in objs}
+
+def vizierCatalog(cat, cache=None):
+    """
+    Function to retrieve a full VizieR catalog (cat is the
+    VizieR catalog code).
+    """
+    def query():
+        from astroquery.vizier import Vizier
+        return Vizier.get_catalogs(cat)
+    return cachedQuery(cache, 'vizier_catalog', [cat], query)
+
+def vizierRegion(obj, cat, searchR, cache=None):
+    """
+    Function to run a single VizieR cone search for obj
+    in catalog cat (the VizieR catalog code) using a
+    search radius searchR (e.g. '10s').
+    """
+    def query():
+        from astroquery.vizier import Vizier
+        res = Vizier(columns=['**', '+_r'], catalog=cat, row_limit=VIZIER_ROW_LIMIT)
+        return res.query_region(obj, radius=searchR)
+    return cachedQuery(cache, 'vizier_region', [cat, obj, searchR, VIZIER_ROW_LIMIT], query)
+
+def queryVizier(obj, catN, searchR, workers=1, cache=None):
+    """
+    Function to query each of the VizieR catalogs in catN
+    (the catalog name dictionary returned by src_onlineDB)
+    for obj. The result of each cone search is returned in
+    a dictionary with the same keys as catN.
+    - workers sets the maximum number of queries sent to
+      VizieR at any one time. With workers=1, catalogs are
+      queried one after the other.
+    - 2MASS photometry is retrieved from SIMBAD so is skipped.
+    """
+    todo = [o for o in catN if o != '2MASS']
+    if workers <= 1:
+        return {o : vizierRegion(obj, catN[o], searchR, cache) for o in todo}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {o : pool.submit(vizierRegion, obj, catN[o], searchR, cache) for o in todo}
+        # collect in catN order so that any exception is raised for
+        # the first failing catalog, as it would be for a serial run:
+        return {o : futures[o].result() for o in todo}
+
+def vizierRegionMulti(coords, cat, searchR, chunk=500):
+    """
+    Function to run a multi-position VizieR cone search in
+    catalog cat for each of the positions in coords (an array
+    SkyCoord object), uploading at most chunk positions per
+    request. Returns a list with one TableList per position, 
+    formatted as the result of a single cone search.
+    """
+    from astroquery.vizier import Vizier
+    from astroquery.utils import TableList
+    res = Vizier(columns=['**', '+_r'], catalog=cat, row_limit=VIZIER_ROW_LIMIT)
+    perPos = [TableList([]) for c in range(0, len(coords))]
+    for start in range(0, len(coords), chunk):
+        result = res.query_region(coords[start:start+chunk], radius=searchR)
+        if cat not in result.keys():
+            continue
+        table = result[cat]
+        if '_q' not in table.colnames:
+            # single position in this chunk:
+            perPos[start] = TableList([(cat, table)])
+            continue
+        for q in sorted(set(table['_q'])):
+            # _q is the 1-based index of the position within the chunk
+            perPos[start+int(q)-1] = TableList([(cat, table[table['_q'] == q])])
+    return perPos
+
+def queryVizierMulti(objs, coords, catN, searchR, workers=1, cache=None):
+    """
+    Batch version of queryVizier: each VizieR catalog in catN is 
+    queried once for all objects in objs (with sky positions 
+    coords). A list of dictionaries, one per object and each 
+    formatted as returned by queryVizier, is returned.
+    - results are read from and saved to cache per object, so
+      only objects missing from the cache are sent to VizieR.
+    """
+    todo = [o for o in catN if o != '2MASS']
+    
+    def queryCat(o):
+        perObj = [None]*len(objs)
+        # (the same cache keys as used by vizierRegion)
+        keys = [cache.key('vizier_region', [catN[o], obj, searchR, VIZIER_ROW_LIMIT])
+                for obj in objs] if cache is not None else []
+        if cache is not None:
+            for t in range(0, len(objs)):
+                found, res = cache.get(keys[t])
+                if found:
+                    perObj[t] = res
+        miss = [t for t in range(0, len(objs)) if perObj[t] is None]
+        if len(miss) != 0:
+            results = vizierRegionMulti(coords[miss], catN[o], searchR)
+            for t, res in zip(miss, results):
+                if cache is not None:
+                    cache.put(keys[t], 'vizier_region', res)
+                perObj[t] = res
+        return perObj
+    
+    if workers <= 1:
+        perCat = {o : queryCat(o) for o in todo}
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {o : pool.submit(queryCat, o) for o in todo}
+            perCat = {o : futures[o].result() for o in todo}
+    
+    return [{o : perCat[o][t] for o in todo} for t in range(0, len(objs))]
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+import matplotlib
+matplotlib.use('Agg') # non-interactive: no display is needed
+import argparse
+import sys, os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from plot import renderSED
+
+description = \
+"""
+description:
+    Render the SEDs of many objects to file (e.g. pdf
+    plots and png thumbnails for an atlas) without
+    any interactive plotting. Objects are rendered in
+    parallel.
+
+"""
+epilog = \
+"""
+examples:
+    renderSED.py --phot=AKSco/AKSco_phot.dat,HD283571/HD283571_phot.dat
+    renderSED.py --list=atlas.txt --fmt=png --dpi=50 --outdir=thumbs --workers=8
+
+    where each line of atlas.txt gives a photometry file, optionally
+    followed by a comma-separated list of spectrum files and a
+    comma-separated list of spectrum scale factors, e.g.
+    AKSco/AKSco_phot.dat AKSco/28902101_sws.fit 1.2
+
+"""
+
+def readList(listFile):
+    """
+    Read the objects to render from listFile: one photometry
+    file per line, optionally followed by comma-separated lists
+    of spectrum files and of scale factors for those spectra.
+    Returns a list of (photometry file, spectrum files, scales).
+    """
+    objs = []
+    with open(listFile) as f_in:
+        for line in f_in:
+            cols = line.split('#')[0].split()
+            if len(cols) == 0:
+                continue
+            specFiles = cols[1].split(',') if len(cols) > 1 else None
+            specS = [float(s) for s in cols[2].split(',')] if len(cols) > 2 else None
+            objs.append((cols[0], specFiles, specS))
+    return objs
+
+def findSpectra(photFile):
+    """
+    All spectrum (.fit or .fits) files in the directory of
+    photFile (i.e. those downloaded by queryDB.py).
+    """
+    objDir = Path(photFile).parent
+    return sorted([str(s) for s in list(objDir.glob('*.fit'))+list(objDir.glob('*.fits'))])
+
+def renderOne(job):
+    """
+    Render the SED for one object (job is a tuple of the
+    arguments passed to plot.renderSED). Errors are returned
+    rather than raised so that one bad object does not stop
+    the rest of a batch.
+    """
+    try:
+        return renderSED(*job), None
+    except Exception as e:
+        return job[1], str(job[0])+': '+type(e).__name__+': '+str(e)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=description,epilog=epilog,
+             formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phot",dest="phot",default='',type=str,
+                        help='Comma-separated list of photometry data files.')
+    parser.add_argument("--list",dest="list",default='',type=str,
+                        help='File listing the photometry (and spectrum) files to render.')
+    parser.add_argument("--spec-auto",dest="specAuto",action='store_true',
+                        help='Plot all .fit/.fits spectra in each object directory')
+    parser.add_argument("--spec-npz",dest="specNpz",action='store_true',
+                        help='Keep a .npz copy of each converted spectrum next to its fits file')
+    parser.add_argument("--fmt",dest="fmt",default='pdf',type=str,
+                        help='Comma-separated list of output formats (default pdf, e.g. pdf,png)')
+    parser.add_argument("--outdir",dest="outdir",default='',type=str,
+                        help='Directory for the rendered files (default: each object directory)')
+    parser.add_argument("--pltR",dest='plt_range',default='[]',type=str,
+                        help='X-range (in microns) for plot window (free by default)')
+    parser.add_argument("--dpi",dest="dpi",default=150,type=int,
+                        help='Resolution of raster (e.g. png) output (default 150)')
+    parser.add_argument("--workers",dest="workers",default=os.cpu_count(),type=int,
+                        help='Number of objects rendered in parallel (default: number of CPUs)')
+
+    argopt = parser.parse_args()
+
+    objs = []
+    if argopt.phot != '':
+        objs += [(p.strip(), None, None) for p in argopt.phot.split(',')]
+    if argopt.list != '':
+        objs += readList(argopt.list)
+    if objs == []:
+        print('Error: no photometry files given (use --phot or --list)')
+        sys.exit()
+
+    if argopt.plt_range != '[]':
+        x_range = argopt.plt_range.split(',')
+    else:
+        x_range = 'default'
+
+    jobs = []
+    for photF, specFiles, specS in objs:
+        if not Path(photF).exists():
+            print('Warning: file '+photF+' not found, skipping.')
+            continue
+        if specFiles is None and argopt.specAuto:
+            specFiles = findSpectra(photF)
+        outDir = Path(argopt.outdir) if argopt.outdir != '' else Path(photF).parent
+        Path.mkdir(outDir, parents=True, exist_ok=True)
+        outFiles = [outDir / Path(Path(photF).stem+'_sed.'+fmt.strip())
+                    for fmt in argopt.fmt.split(',')]
+        jobs.append((photF, outFiles, specFiles, specS, x_range, (6., 4.), argopt.dpi,
+                     argopt.specNpz))
+
+    def report(results):
+        nFail = 0
+        for outFiles, err in results:
+            if err is None:
+                for outF in outFiles:
+                    print(outF)
+            else:
+                print('Warning: could not render '+err)
+                nFail += 1
+        return nFail
+
+    if argopt.workers <= 1 or len(jobs) <= 1:
+        nFail = report(map(renderOne, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=argopt.workers) as pool:
+            nFail = report(pool.map(renderOne, jobs,
+                                    chunksize=max(1, len(jobs)//(4*argopt.workers))))
+
+    print('')
+    print('Info: rendered '+str(len(jobs)-nFail)+' of '+str(len(jobs))+' SEDs.')
@@ -1,41 +1,91 @@
 import os
 from math import log
 import numpy as np
-from astropy.io import fits as pyfits
 from pathlib import Path
 
-def read_ascii(file):
+# column names of the two sedbys photometry file layouts:
+PHOT_COLS = {'raw' : ['wvlen', 'band', 'mag', 'emag', 'fmag', 'unit', 'beam', 'odate', 'ref'],
+             'cleaned' : ['wvlen', 'band', 'lamFlam', 'elamFlam', 'flamFlam', 'beam', 'odate', 'ref']}
+
+def phot_layout(file):
     """
-    Function to read in photometric data from
-    original '_phot.dat' style sedbys file.
+    Function to determine whether a sedbys photometry file
+    is in the original '_phot.dat' layout ('raw') or the
+    '_phot_cleaned.dat' layout ('cleaned') from its header
+    (or, failing that, from the number of columns).
     - file is a pathlib.Path object
     """
-    wvlen, band, mag, emag, fmag, unit, beam, odate, ref = [],[],[],[],[],[],[],[],[]
     with open(file, 'r') as f_in:
         for line in f_in:
-            try:
-                # ensure line contains data:
-                a = float(line[0])
-            except ValueError:
-                a = 'dummy'
+            if line.startswith('lam '):
+                return 'cleaned' if 'lamFlam' in line else 'raw'
+            if line[:1].isdigit():
+                return 'raw' if len(line.split()) == len(PHOT_COLS['raw']) else 'cleaned'
+    return 'raw'
+
+def _phot_chunk(cols, layout):
+    names = PHOT_COLS[layout]
+    arrs = [np.array(cols[i], dtype=float) if i in (0, 2) else np.array(cols[i], dtype=str)
+            for i in range(0, len(names))]
+    return np.rec.fromarrays(arrs, names=names)
+
+def iter_phot(file, chunksize=10000, layout=None):
+    """
+    Function to read photometric data from a sedbys
+    photometry file (either layout) in chunks of up to
+    chunksize lines. Each chunk is a NumPy record array
+    with the columns given in PHOT_COLS (wavelength and
+    flux as floats, all other columns as strings). Lines
+    with no flux measurement ('--') are skipped.
+    - file is a pathlib.Path object
+    """
+    if layout is None:
+        layout = phot_layout(file)
+    ncol = len(PHOT_COLS[layout])
+    cols = [[] for i in range(0, ncol)]
+    with open(file, 'r') as f_in:
+        for line in f_in:
+            if not line[:1].isdigit():
+                # line does not contain data
+                continue
+            parts = line.strip().split(' ')
             try:
                 # ensure mag or flux entry is not '--'
-                m = float(line.split(' ')[2])
-            except ValueError:
-                m = 'dummy'
-            
-            if isinstance(a, float) and isinstance(m, float):
-                wvlen.append(float(line.strip().split(' ')[0])) # in metres
-                band.append(line.strip().split(' ')[1])
-                mag.append(float(line.strip().split(' ')[2]))
-                emag.append(line.strip().split(' ')[3])
-                fmag.append(line.strip().split(' ')[4])
-                unit.append(line.strip().split(' ')[5])
-                beam.append(line.strip().split(' ')[6])
-                odate.append(line.strip().split(' ')[7])
-                ref.append(line.strip().split(' ')[8])
-    
-    return wvlen, band, mag, emag, fmag, unit, beam, odate, ref
+                wv, m = float(parts[0]), float(parts[2])
+            except (ValueError, IndexError):
+                continue
+            cols[0].append(wv)
+            cols[2].append(m)
+            for i in (1,)+tuple(range(3, ncol)):
+                cols[i].append(parts[i])
+            if len(cols[0]) == chunksize:
+                yield _phot_chunk(cols, layout)
+                cols = [[] for i in range(0, ncol)]
+    if len(cols[0]) != 0:
+        yield _phot_chunk(cols, layout)
+
+def read_phot(file, layout=None):
+    """
+    Function to read all photometric data from a sedbys
+    photometry file (either layout) into a single NumPy
+    record array (see iter_phot).
+    - file is a pathlib.Path object
+    """
+    if layout is None:
+        layout = phot_layout(file)
+    chunks = list(iter_phot(file, layout=layout))
+    if len(chunks) == 0:
+        return _phot_chunk([[] for c in PHOT_COLS[layout]], layout)
+    return np.concatenate(chunks).view(np.recarray)
+
+def read_ascii(file):
+    """
+    Function to read in photometric data from
+    original '_phot.dat' style sedbys file.
+    - file is a pathlib.Path object
+    """
+    phot = read_phot(file, layout='raw')
+    return tuple(phot[c].tolist() for c in PHOT_COLS['raw'])
 
 def read_cleaned(file):
     """
@@ -44,32 +94,49 @@ def read_cleaned(file):
     file.
     - file is a pathlib.Path object
     """
-    wvlen, band, lamFlam, elamFlam, flamFlam, beam, odate, ref = [],[],[],[],[],[],[],[]
-    with open(file, 'r') as f_in:
-        for line in f_in:
-            try:
-                # ensure line contains data:
-                a = float(line[0])
-            except ValueError:
-                a = 'dummy'
-            try:
-                # ensure mag or flux entry is not '--'
-                m = float(line.split(' ')[2])
-            except ValueError:
-                m = 'dummy'
-            
-            if isinstance(a, float) and isinstance(m, float):
-                wvlen.append(float(line.strip().split(' ')[0])) # in metres
-                band.append(line.strip().split(' ')[1])
-                lamFlam.append(float(line.strip().split(' ')[2]))
-                elamFlam.append(line.strip().split(' ')[3])
-                flamFlam.append(line.strip().split(' ')[4])
-                beam.append(line.strip().split(' ')[5])
-                odate.append(line.strip().split(' ')[6])
-                ref.append(line.strip().split(' ')[7])
+    phot = read_phot(file, layout='cleaned')
+    return tuple(phot[c].tolist() for c in PHOT_COLS['cleaned'])
     
-    return wvlen, band, lamFlam, elamFlam, flamFlam, beam, odate, ref
+
+def write_cleaned(infile, phot, drop=[]):
+    """
+    Function to write photometric data (in the layout returned 
+    by read_cleaned) to a new "cleaned" '_phot_cleaned_N.dat'
+    style sedbys file alongside infile, leaving out the entries
+    whose indices are in drop. The header of infile is copied
+    and N is chosen to avoid over-writing existing files.
+    - infile is a pathlib.Path object
+    Returns the path of the new file.
+    """
+    wvlen,wband,f,ef,flag,beam,odate,ref = phot
+    if 'cleaned' not in infile.name:
+        outfile = infile.parent / Path(infile.stem+'_cleaned_')
+    else:
+        outfile = infile.parent / Path(infile.stem)
+    j = 0
+    while Path(str(outfile)+str(j)+'.dat').exists():
+        j += 1 # avoids over-writing other attempts to clean data file
     
+    outfile = Path(str(outfile)+str(j)+'.dat')
+    drop = set(int(i) for i in drop)
+    with open(outfile,'w') as f_out:
+        with open(infile, 'r') as f_in:
+            for line in f_in:
+                try:
+                    a = float(line[0])
+                except ValueError:
+                    f_out.write(line.replace('mag','lamFlam').replace('m -- -- --','m -- W/m^2 W/m^2'))
+        for i in range(0, len(wvlen)):
+            if i not in drop:
+                f_out.write(' '.join([str(x) for x in [wvlen[i], # wavelength in m
+                                                       wband[i], # waveband 
+                                                       f[i],     # flux in W/m^2
+                                                       ef[i],    # flux error in W/m^2
+                                                       flag[i],  # flag on flux
+                                                       beam[i],  # beam size (may be dummy value)
+                                                       odate[i], # obs date (may be unknown or average)
+                                                       ref[i]]])+'\n') # reference for original data
+    return outfile
 
 def read_zp(file):
     """
@@ -91,15 +158,54 @@ def read_zp(file):
     
     return zpWave, zpF0
 
+# zero points already read in, keyed on file path:
+_zpRegistry = {}
+
+def get_zp(file=None):
+    """
+    Function to retrieve the zero points from zero_points.dat,
+    reading the file only once per session (or again if it has
+    been modified since it was last read).
+    - file is a pathlib.Path object (default: zero_points.dat
+      in $SED_BUILDER)
+    Returns a dictionary with entries zpWave and zpF0 (as returned
+    by read_zp), index (a band name to array index lookup) and
+    F0 (array of zero points, ordered as index).
+    """
+    if file == None:
+        file = Path(os.environ['SED_BUILDER']) / Path('zero_points.dat')
+    file = Path(file)
+    mtime = file.stat().st_mtime
+    zp = _zpRegistry.get(file)
+    if zp is None or zp['mtime'] != mtime:
+        zpWave, zpF0 = read_zp(file)
+        bands = list(zpF0)
+        zp = {'mtime' : mtime, 'zpWave' : zpWave, 'zpF0' : zpF0,
+              'index' : {b : i for i, b in enumerate(bands)},
+              'F0' : np.array([zpF0[b] for b in bands], dtype=float)}
+        _zpRegistry[file] = zp
+    return zp
+
 def magToJy(mag,emag,wband,zpFile=None):
     """
     Function to flux convert magnitude data using
     zero_points.dat file.
+    - mag, emag and wband may be single values or
+      equal-length arrays (of magnitude, error and
+      waveband name), in which case arrays of flux and
+      flux error in Jy are returned. An error of '--'
+      (or nan) gives a nan flux error.
     """
-    if zpFile == None:
-        zpFile = Path(os.environ['SED_BUILDER']) / Path('zero_points.dat')
-    zpWave, zpF0 = read_zp(zpFile)
-    F0 = zpF0[wband]
+    zp = get_zp(zpFile)
+    if np.ndim(mag) != 0:
+        mag = np.asarray(mag, dtype=float)
+        emag = np.array([np.nan if e == '--' else float(e) for e in emag], dtype=float)
+        F0 = zp['F0'][[zp['index'][b] for b in wband]]
+        jy = (10**(-mag/2.5))*F0
+        ejy = (emag/2.5)*jy*log(10)
+        return jy, ejy
+    
+    F0 = zp['zpF0'][wband]
     jy = (10**(-float(mag)/2.5))*F0
     if emag != '--':
         ejy = (float(emag)/2.5)*jy*log(10)
@@ -116,6 +222,51 @@ def JyToLamFlam(jy,ejy,wave):
     elamFlam = ejy*1e-26*c_light*(1/wave)
     return lamFlam, elamFlam
 
+def photToLamFlam(wvlen,wband,flux,eflux,unit,zpFile=None):
+    """
+    Function to flux convert a photometry table (as
+    returned by read_ascii) to lamFlam (W/m^2) in one
+    batched pass.
+    - wvlen is in metres
+    - eflux entries of '--' are treated as nan
+    - unit entries must be one of 'mag', 'mJy' or 'Jy'
+    Upper limits (flux = eflux) are retained as such
+    for fluxes provided in mJy or Jy.
+    Returns arrays of lamFlam and its error.
+    """
+    wvlen = np.asarray(wvlen, dtype=float)
+    jy = np.array(flux, dtype=float)
+    ejy = np.array([np.nan if e == '--' else float(e) for e in eflux], dtype=float)
+    unit = np.asarray(unit, dtype=str)
+    
+    isMag = unit == 'mag'
+    if isMag.any():
+        jy[isMag], ejy[isMag] = magToJy(jy[isMag], ejy[isMag], np.asarray(wband)[isMag], zpFile)
+    isMJy = unit == 'mJy'
+    jy[isMJy] = jy[isMJy]*1e-3
+    ejy[isMJy] = ejy[isMJy]*1e-3
+    
+    return JyToLamFlam(jy, ejy, wvlen)
+
+def convert_sed(phot):
+    """
+    Function to convert photometry to lamFlam (W/m^2).
+    - phot is a sedbys photometry file (either layout) or
+      a record array of its contents (as returned by 
+      read_phot, or by queryDB.collect_photometry)
+    Returns the photometry as returned by read_cleaned,
+    i.e. (wvlen, band, lamFlam, elamFlam, flag, beam, 
+    odate, ref).
+    """
+    if not isinstance(phot, np.ndarray):
+        phot = read_phot(phot)
+    cols = phot.dtype.names
+    if 'lamFlam' in cols:
+        return tuple(phot[c].tolist() for c in PHOT_COLS['cleaned'])
+    f, ef = photToLamFlam(phot['wvlen'], phot['band'], phot['mag'], phot['emag'], phot['unit'])
+    return (phot['wvlen'].tolist(), phot['band'].tolist(), f, ef, phot['fmag'].tolist(),
+            phot['beam'].tolist(), phot['odate'].tolist(), phot['ref'].tolist())
+
 
 
 def read_spectrum(specfile):
@@ -129,25 +280,85 @@ def read_spectrum(specfile):
      (rms plus systematic for CASSIS)
     - Data in column 4 is the error on the flux
      (statistical and normalisation for ISO)
+    Returns arrays of wavelength (microns), lamFlam and its
+    error (W/m^2), sorted by wavelength, and the plot colour.
     """
-    hdu = pyfits.open(specfile)
-    w = [a[0] for a in hdu[0].data]
-    f     = [a[1] for a in hdu[0].data]
     if 'cassis' in specfile.name:
-        ef    = [a[2] for a in hdu[0].data]
+        ecol = 2
         colS = 'b'
     elif 'sws' in specfile.name:
-        ef    = [a[3] for a in hdu[0].data]
+        ecol = 3
         colS = 'g'
     
-    f2, ef2 = [], []
-    for i in range(0, len(f)):
-        f2.append(JyToLamFlam(f[i],ef[i],w[i]*1e-6)[0])
-        ef2.append(JyToLamFlam(f[i],ef[i],w[i]*1e-6)[1])
+    from astropy.io import fits as pyfits # only needed for spectra
+    with pyfits.open(specfile, memmap=True) as hdu:
+        # copy just the required columns out of the memory-mapped file
+        # (converting to native byte order):
+        data = hdu[0].data
+        w  = np.array(data[:, 0], dtype=float)
+        f  = np.array(data[:, 1], dtype=float)
+        ef = np.array(data[:, ecol], dtype=float)
+    
+    f2, ef2 = JyToLamFlam(f, ef, w*1e-6)
+    order = np.argsort(w, kind='stable')
+    
+    return w[order], f2[order], ef2[order], colS
+
+# spectra already read in and converted, keyed on (file path, scale):
+_specRegistry = {}
+
+def spec_npz(specfile):
+    """
+    Path of the .npz copy of the converted data for spectrum
+    file specfile (saved alongside it, e.g. X.fits.npz).
+    """
+    return specfile.parent / Path(specfile.name+'.npz')
+
+def load_spectrum(specfile, scale=1, npz=False):
+    """
+    Function to retrieve the spectrum in specfile (as returned
+    by read_spectrum, with flux and its error multiplied by 
+    scale), reading and converting the file only once per
+    session (or again if it has been modified since).
+    - if npz=True, the converted data are also saved to a .npz
+      file next to specfile (see spec_npz) and read from there 
+      in later sessions, unless specfile has since changed.
+    The returned arrays are shared between calls so must not be
+    modified in place.
+    """
+    specfile = Path(specfile)
+    st = specfile.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = (specfile.resolve(), float(scale))
+    spec = _specRegistry.get(key)
+    if spec is not None and spec[0] == stamp:
+        return spec[1]
     
-    wvlen = [a[0] for a in sorted(zip(w,f2))]
-    flux  = [a[1] for a in sorted(zip(w,f2))]
-    eflux = [a[1] for a in sorted(zip(w,ef2))]
+    base = _specRegistry.get((key[0], 1.0))
+    if base is not None and base[0] == stamp:
+        w, f, ef, colS = base[1]
+    else:
+        w = None
+        npzFile = spec_npz(specfile)
+        if npz and npzFile.exists():
+            with np.load(npzFile) as d:
+                if tuple(d['stamp']) == stamp:
+                    w, f, ef, colS = d['w'], d['f'], d['ef'], str(d['colS'])
+        if w is None:
+            w, f, ef, colS = read_spectrum(specfile)
+            if npz:
+                # write via a temporary file so that a partial .npz is never read:
+                tmpF = npzFile.parent / Path(npzFile.name+'.'+str(os.getpid())+'.tmp')
+                try:
+                    with open(tmpF, 'wb') as f_out:
+                        np.savez(f_out, w=w, f=f, ef=ef, colS=colS, stamp=np.array(stamp))
+                    tmpF.replace(npzFile)
+                except OSError:
+                    # e.g. read-only data directory: keep the in-memory copy only
+                    if tmpF.exists():
+                        tmpF.unlink()
+        _specRegistry[(key[0], 1.0)] = (stamp, (w, f, ef, colS))
     
-    return wvlen,flux,eflux,colS
-    
\ No newline at end of file
+    if float(scale) != 1.0:
+        _specRegistry[key] = (stamp, (w, f*scale, ef*scale, colS))
+    return _specRegistry[key][1]
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import json
+import math
+import sys, os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from pathlib import Path
+
+description = \
+"""
+description:
+    Run SEDBYS as a long-lived service with an HTTP/JSON API
+    (sedbys.py serve). The catalog registry, local database
+    index, zero points and query caches are loaded once and
+    kept in memory, so that each request only pays for the
+    work specific to it. Requests are run on a pool of worker
+    threads, and concurrent requests for the same object are
+    coalesced so that the work is only done once.
+
+    endpoints (GET with query parameters, or POST with the
+    same parameters as a JSON object):
+    /collect?obj=HD_283571&rad=10s   collate the photometry (as
+                queryDB.py --closest=True) and return it as JSON.
+                Add refresh=1 to re-collate an existing file.
+    /convert?obj=HD_283571           the photometry converted to
+                lamFlam (W/m^2), as JSON. phot=<file> (relative
+                to --datadir) may be given instead of obj.
+    /render?obj=HD_283571&fmt=png    the SED plot (fmt = png, pdf
+                or svg; also dpi, pltR=0.1,1000 and spec=auto to
+                plot the spectra in the object directory).
+    /status                          request and cache counts.
+
+"""
+epilog = \
+"""
+examples:
+    sedbys.py serve --port=8080 --datadir=seds --workers=8
+    sedbys.py serve --offline --replay --cache-dir=recorded/
+    curl 'http://localhost:8080/convert?obj=HD_283571'
+
+"""
+
+# content type of each supported render format:
+RENDER_TYPES = {'png' : 'image/png', 'pdf' : 'application/pdf', 'svg' : 'image/svg+xml'}
+
+class UnknownEndpoint(Exception):
+    """
+    Raised for a request to an endpoint which does not exist.
+    """
+
+class NotCollated(Exception):
+    """
+    Raised when the photometry for an object could not be
+    collated (e.g. the name is not recognised by SIMBAD).
+    """
+
+def jsonValues(values):
+    """
+    List of the values in the array (or list) values, with nan
+    and inf replaced by None so that they may be written as JSON.
+    """
+    out = []
+    for v in list(values):
+        if hasattr(v, 'item'):
+            v = v.item() # numpy scalar to python
+        if isinstance(v, float) and not math.isfinite(v):
+            v = None
+        out.append(v)
+    return out
+
+def flag(value):
+    """
+    Boolean value of a request parameter (e.g. refresh=1).
+    """
+    return str(value).lower() in ['1', 'true', 'yes']
+
+class SEDService:
+    """
+    Collect, convert and render SEDs for the objects requested,
+    re-using one queryDB.PhotSession (i.e. one set of catalogs,
+    local database index and query caches) for every request.
+    - dataDir is the directory in which the photometry for each
+      object is written (in <obj>/<obj>_phot.dat, as for queryDB.py)
+    - workers is the number of requests processed at once; the
+      blocking work for each request is run on this pool.
+    - queryWorkers is the number of VizieR catalogs queried at
+      once for each object.
+    Requests for the same work (e.g. to collect the same object)
+    made while it is in progress share its result rather than
+    repeating it.
+    """
+    def __init__(self, session, dataDir='.', workers=4, queryWorkers=1):
+        self.session = session
+        self.dataDir = Path(dataDir).resolve()
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.queryWorkers = queryWorkers
+        self.counts = {'requests' : 0, 'coalesced' : 0, 'errors' : 0}
+        self._pending = {}
+        self._lock = threading.RLock()
+        # matplotlib is not thread-safe, so only one SED is drawn at a time:
+        self._renderLock = threading.Lock()
+
+    def submit(self, key, func, *args):
+        """
+        Run func(*args) on the pool and return its Future, or
+        return the Future of the job already running for key.
+        """
+        with self._lock:
+            self.counts['requests'] += 1
+            fut = self._pending.get(key)
+            if fut is not None:
+                self.counts['coalesced'] += 1
+                return fut
+            fut = self.pool.submit(func, *args)
+            self._pending[key] = fut
+        fut.add_done_callback(lambda f: self._done(key, f))
+        return fut
+
+    def _done(self, key, fut):
+        with self._lock:
+            if self._pending.get(key) is fut:
+                del self._pending[key]
+            if fut.exception() is not None:
+                self.counts['errors'] += 1
+
+    def photFile(self, obj):
+        """
+        Path of the photometry file for obj in dataDir.
+        """
+        name = obj.replace(' ', '')
+        if name == '' or '/' in name or '\\' in name or name.startswith('.'):
+            raise ValueError('invalid object name: '+obj)
+        return self.dataDir / name / (name+'_phot.dat')
+
+    def dataFile(self, phot):
+        """
+        Path of the (existing) photometry file phot, given
+        relative to dataDir. Files outside dataDir are refused.
+        """
+        path = (self.dataDir / phot).resolve()
+        if self.dataDir not in path.parents:
+            raise ValueError('file must be within the data directory: '+phot)
+        if not path.exists():
+            raise FileNotFoundError('file '+phot+' not found')
+        return path
+
+    def _collect(self, obj, radius, refresh, getSpect):
+        output = self.photFile(obj)
+        if output.exists() and not refresh:
+            return output
+        # the photometry is written to a temporary file which then replaces
+        # the output, so that other requests never read a partly written file:
+        tmpF = output.parent / ('.'+output.name+'.'+str(threading.get_ident())+'.tmp')
+        try:
+            result = self.session.collect(obj, radius, closest=True, getSpect=getSpect,
+                                          workers=self.queryWorkers, output=tmpF)
+            if result is None:
+                raise NotCollated('photometry could not be collated for '+obj)
+            os.replace(tmpF, output)
+        finally:
+            if tmpF.exists():
+                tmpF.unlink()
+        return output
+
+    def collect(self, obj, radius='10s', refresh=False, getSpect=False):
+        """
+        Collate the photometry for obj (if not already in dataDir,
+        or if refresh=True). Returns the photometry file.
+        """
+        self.photFile(obj) # check the name before queueing
+        return self.submit(('collect', obj, radius, refresh, getSpect), self._collect,
+                           obj, radius, refresh, getSpect).result()
+
+    def _convert(self, photF):
+        from sed_input import convert_sed
+        wvlen,wband,f,ef,flag,beam,odate,ref = convert_sed(photF)
+        return {'file' : str(photF.relative_to(self.dataDir)),
+                'wvlen' : jsonValues(wvlen), 'band' : jsonValues(wband),
+                'lamFlam' : jsonValues(f), 'elamFlam' : jsonValues(ef),
+                'flag' : jsonValues(flag), 'beam' : jsonValues(beam),
+                'odate' : jsonValues(odate), 'ref' : jsonValues(ref)}
+
+    def convert(self, photF):
+        """
+        The photometry in photF converted to lamFlam (W/m^2; see
+        sed_input.convert_sed), as a dictionary of lists.
+        """
+        return self.submit(('convert', str(photF), photF.stat().st_mtime_ns),
+                           self._convert, photF).result()
+
+    def _render(self, photF, fmt, dpi, x_range, spec):
+        from plot import renderSED
+        specFiles = None
+        if spec:
+            from renderSED import findSpectra
+            specFiles = findSpectra(photF)
+        out = io.BytesIO()
+        with self._renderLock:
+            renderSED(photF, [out], specFiles, None, x_range, dpi=dpi, fmt=fmt)
+        return out.getvalue()
+
+    def render(self, photF, fmt='png', dpi=150, x_range='default', spec=False):
+        """
+        The SED plot for the photometry in photF (see
+        plot.renderSED) in format fmt, as bytes.
+        """
+        if fmt not in RENDER_TYPES:
+            raise ValueError('fmt must be one of '+', '.join(RENDER_TYPES))
+        key = ('render', str(photF), photF.stat().st_mtime_ns, fmt, dpi, str(x_range), spec)
+        return self.submit(key, self._render, photF, fmt, dpi, x_range, spec).result()
+
+    def status(self):
+        """
+        Request counts and the number of jobs in progress.
+        """
+        with self._lock:
+            out = dict(self.counts)
+            out['pending'] = len(self._pending)
+        out['dataDir'] = str(self.dataDir)
+        if self.session.cache is not None:
+            out['cacheDir'] = str(self.session.cache.cacheDir)
+        return out
+
+    def handle(self, path, params):
+        """
+        Handle a request for endpoint path with the dictionary
+        of parameters params. Returns (content type, body).
+        """
+        if path == '/status':
+            return 'application/json', self.status()
+
+        if path not in ['/collect', '/convert', '/render']:
+            raise UnknownEndpoint('unknown endpoint '+path)
+        obj = params.get('obj', '').replace('_', ' ').strip()
+        radius = params.get('rad', '10s')
+        if path == '/collect' or 'phot' not in params:
+            if obj == '':
+                raise ValueError('obj (or phot) must be given')
+            photF = self.collect(obj, radius, flag(params.get('refresh', '')),
+                                 flag(params.get('getSpect', '')))
+        else:
+            photF = self.dataFile(params['phot'])
+
+        if path == '/collect':
+            from sed_input import read_phot
+            phot = read_phot(photF)
+            return 'application/json', {'obj' : obj, 'file' : str(photF.relative_to(self.dataDir)),
+                                        'phot' : {c : jsonValues(phot[c]) for c in phot.dtype.names}}
+        elif path == '/convert':
+            return 'application/json', self.convert(photF)
+        else:
+            fmt = params.get('fmt', 'png')
+            x_range = params.get('pltR', 'default')
+            if x_range != 'default':
+                x_range = x_range.split(',')
+            body = self.render(photF, fmt, int(params.get('dpi', 150)), x_range,
+                               params.get('spec', '') == 'auto')
+            return RENDER_TYPES[fmt], body
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
+
+def makeHandler(service):
+    """
+    Request handler class for an http.server serving service.
+    """
+    class SEDHandler(BaseHTTPRequestHandler):
+        def respond(self, params):
+            url = urlparse(self.path)
+            params.update({k : v[-1] for k, v in parse_qs(url.query).items()})
+            try:
+                ctype, body = service.handle(url.path.rstrip('/') or '/', params)
+                code = 200
+            except (UnknownEndpoint, NotCollated, FileNotFoundError) as e:
+                code, ctype, body = 404, 'application/json', {'error' : str(e)}
+            except ValueError as e:
+                code, ctype, body = 400, 'application/json', {'error' : str(e)}
+            except OSError as e:
+                # e.g. SIMBAD or VizieR could not be reached
+                code, ctype, body = 502, 'application/json', {'error' : type(e).__name__+': '+str(e)}
+            except Exception as e:
+                code, ctype, body = 500, 'application/json', {'error' : type(e).__name__+': '+str(e)}
+            if ctype == 'application/json':
+                body = json.dumps(body).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', ctype)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self.respond({})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            try:
+                params = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                params = None
+            if not isinstance(params, dict):
+                body = json.dumps({'error' : 'request body must be a JSON object'}).encode('utf-8')
+                self.send_response(400)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            self.respond({k : str(v) for k, v in params.items()})
+
+    return SEDHandler
+
+def serve(service, host='localhost', port=8080):
+    """
+    Function to serve service over HTTP on host:port until
+    interrupted. Returns the server (after shutdown).
+    """
+    server = ThreadingHTTPServer((host, port), makeHandler(service))
+    print('Info: serving SEDBYS on http://'+host+':'+str(server.server_address[1])+'/')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    service.shutdown()
+    return server
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=description,epilog=epilog,
+             formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command')
+    servep = sub.add_parser('serve', help='Run the HTTP/JSON service',
+                            description=description, epilog=epilog,
+                            formatter_class=argparse.RawDescriptionHelpFormatter)
+    servep.add_argument("--host",dest="host",default='localhost',type=str,
+                        help='Address to listen on (default localhost)')
+    servep.add_argument("--port",dest="port",default=8080,type=int,
+                        help='Port to listen on (default 8080)')
+    servep.add_argument("--datadir",dest="dataDir",default='.',type=str,
+                        help='Directory in which the object directories are written (default: current)')
+    servep.add_argument("--workers",dest="workers",default=4,type=int,
+                        help='Number of requests processed at once (default 4)')
+    servep.add_argument("--query-workers",dest="queryWorkers",default=1,type=int,
+                        help='Number of VizieR catalogs queried at once per object (default 1)')
+    servep.add_argument("--ldb",dest='ldb',default='',type=str,
+                        help='')
+    servep.add_argument("--offline",dest="offline",action='store_true',
+                        help='Do not update the local SEDBYS git repo (git pull) at start-up')
+    servep.add_argument("--cache-dir",dest="cacheDir",default='',type=str,
+                        help='Directory for the SIMBAD/VizieR query cache (default ~/.cache/sedbys)')
+    servep.add_argument("--no-cache",dest="noCache",action='store_true',
+                        help='Always query SIMBAD and VizieR directly')
+    servep.add_argument("--replay",dest="replay",action='store_true',
+                        help='Only serve SIMBAD/VizieR responses recorded in the query cache (no network)')
+
+    argopt = parser.parse_args()
+
+    if argopt.command != 'serve':
+        parser.print_help()
+        sys.exit()
+    if argopt.replay and argopt.noCache:
+        print('Error: --replay needs the query cache (do not use --no-cache)')
+        sys.exit()
+
+    from queryDB import PhotSession
+    from sed_input import get_zp
+
+    try:
+        session = PhotSession(argopt.ldb, 'True', cacheDir=argopt.cacheDir, noCache=argopt.noCache,
+                              offline=argopt.offline, replay=argopt.replay)
+    except (FileNotFoundError, KeyError):
+        sys.exit()
+    get_zp() # load the zero points before the first request
+
+    Path.mkdir(Path(argopt.dataDir), parents=True, exist_ok=True)
+    os.chdir(argopt.dataDir) # queryDB writes each object directory to the working directory
+    service = SEDService(session, '.', argopt.workers, argopt.queryWorkers)
+    serve(service, argopt.host, argopt.port)
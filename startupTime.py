@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import argparse
+import subprocess
+import sys, os
+from pathlib import Path
+
+description = \
+"""
+description:
+    Check the start-up time of the SEDBYS scripts: each
+    module is imported in a fresh python interpreter with
+    'python -X importtime' and its cumulative import time
+    compared to a budget. The check also fails if a module
+    imports any of the heavy packages (astroquery, astropy,
+    matplotlib or matplotlib.pyplot, scipy) which it should only
+    load on the code paths that use them. Returns a non-zero exit status if
+    any check fails, so that it may be used as a regression
+    test.
+
+"""
+epilog = \
+"""
+examples:
+    startupTime.py
+    startupTime.py --modules=queryDB,toLaTex --budget=0.5 --top=10
+
+"""
+
+# module : (import time budget in seconds, packages it must not import)
+BUDGETS = {'queryDB' : (1.0, ['astroquery', 'astropy', 'matplotlib', 'scipy', 'getSpect']),
+           'inspectSED' : (1.0, ['astroquery', 'astropy', 'matplotlib', 'scipy']),
+           'toLaTex' : (1.0, ['astroquery', 'astropy', 'matplotlib', 'scipy']),
+           'cleaning' : (1.0, ['astroquery', 'astropy', 'matplotlib', 'scipy']),
+           'queryOnline' : (1.0, ['astroquery', 'astropy']),
+           'plot' : (2.0, ['astroquery', 'astropy', 'scipy', 'matplotlib.pyplot']),
+           'renderSED' : (2.0, ['astroquery', 'astropy', 'scipy', 'matplotlib.pyplot']),
+           'sedbys' : (1.0, ['astroquery', 'astropy', 'matplotlib', 'scipy'])}
+
+def importTime(module, sedDir):
+    """
+    Import module in a fresh interpreter using -X importtime.
+    Returns the cumulative import time of module (seconds) and
+    a list of (cumulative time, name) for every module imported.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = str(sedDir)+os.pathsep+env.get('PYTHONPATH', '')
+    env.setdefault('MPLBACKEND', 'Agg')
+    res = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import '+module],
+                         capture_output=True, text=True, env=env, cwd=str(sedDir))
+    if res.returncode != 0:
+        raise ImportError(res.stderr.strip().split('\n')[-1])
+    total, imports = None, []
+    for line in res.stderr.split('\n'):
+        # e.g. 'import time:       599 |     710955 |   astroquery.simbad'
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        cols = line.split('|')
+        name = cols[2].strip()
+        imports.append((int(cols[1])*1e-6, name))
+        if name == module:
+            total = int(cols[1])*1e-6
+    return total, imports
+
+def checkModule(module, budget, heavy, sedDir, runs=3):
+    """
+    Function to check the import time of module against
+    budget (the best of runs imports is used, to reduce the
+    effect of other load on the machine) and that none of the
+    packages in heavy are imported. Returns the import time,
+    the list of imports from the fastest run and a list of
+    the problems found (empty if the module passes).
+    """
+    best, imports = None, []
+    for r in range(0, runs):
+        total, imp = importTime(module, sedDir)
+        if best is None or total < best:
+            best, imports = total, imp
+    problems = []
+    if best > budget:
+        problems.append('import time {:.3f} s exceeds budget of {:.3f} s'.format(best, budget))
+    # heavy may also list sub-packages (e.g. matplotlib.pyplot):
+    loaded = sorted(set([h for t, n in imports for h in heavy 
+                         if n == h or n.startswith(h+'.')]))
+    if loaded != []:
+        problems.append('imports '+', '.join(loaded))
+    return best, imports, problems
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=description,epilog=epilog,
+             formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules",dest="modules",default='',type=str,
+                        help='Comma-separated list of modules to check (default: all)')
+    parser.add_argument("--budget",dest="budget",default=None,type=float,
+                        help='Import time budget (s) to use for every module')
+    parser.add_argument("--runs",dest="runs",default=3,type=int,
+                        help='Number of imports of each module (the fastest is used, default 3)')
+    parser.add_argument("--top",dest="top",default=0,type=int,
+                        help='List the N slowest imports of each module')
+
+    argopt = parser.parse_args()
+
+    try:
+        sedDir = Path(os.environ['SED_BUILDER'])
+    except KeyError:
+        sedDir = Path(__file__).resolve().parent
+
+    if argopt.modules != '':
+        modules = [m.strip() for m in argopt.modules.split(',')]
+    else:
+        modules = list(BUDGETS.keys())
+
+    nFail = 0
+    for module in modules:
+        budget, heavy = BUDGETS.get(module, (1.0, []))
+        if argopt.budget is not None:
+            budget = argopt.budget
+        try:
+            best, imports, problems = checkModule(module, budget, heavy, sedDir, argopt.runs)
+        except ImportError as e:
+            print('{:12s} FAIL: could not be imported ({})'.format(module, str(e)))
+            nFail += 1
+            continue
+        if problems == []:
+            print('{:12s} {:.3f} s   ok'.format(module, best))
+        else:
+            print('{:12s} {:.3f} s   FAIL: {}'.format(module, best, '; '.join(problems)))
+            nFail += 1
+        if argopt.top > 0:
+            for t, n in sorted([i for i in imports if i[1] != module], reverse=True)[:argopt.top]:
+                print('    {:.3f} s  {}'.format(t, n))
+
+    print('')
+    print('Info: '+str(len(modules)-nFail)+' of '+str(len(modules))+' modules passed.')
+    if nFail != 0:
+        sys.exit(1)
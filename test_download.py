@@ -0,0 +1,90 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+import download
+from download import SpectrumStore, downloadFile
+
+DATA = b'SIMPLE  =                    T' * 100
+
+class Handler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        Handler.requests.append(self.path)
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(DATA)))
+        self.send_header('Content-disposition', 'attachment; filename="srv.fits"')
+        self.end_headers()
+        self.wfile.write(DATA)
+
+    def log_message(self, *args):
+        pass
+
+class TestDownloadFile(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = 'http://127.0.0.1:'+str(cls.server.server_port)+'/spec.fits'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.requests = []
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_store_with_name(self):
+        store = SpectrumStore(self.dir / 'store')
+        out = downloadFile(self.url, self.dir / 'obj', name='a.fits', store=store)
+        self.assertEqual(out, self.dir / 'obj' / 'a.fits')
+        self.assertEqual(out.read_bytes(), DATA)
+        # a second object is linked to the stored copy:
+        out = downloadFile(self.url, self.dir / 'obj2', name='a.fits', store=store)
+        self.assertEqual(out.read_bytes(), DATA)
+        self.assertEqual(len(Handler.requests), 1)
+
+    def test_store_present_in_outDir(self):
+        store = SpectrumStore(self.dir / 'store')
+        Path.mkdir(self.dir / 'obj')
+        (self.dir / 'obj' / 'a.fits').write_bytes(DATA)
+        downloadFile(self.url, self.dir / 'obj', name='a.fits', store=store)
+        self.assertEqual(len(Handler.requests), 0)
+
+    def test_server_name_skipped(self):
+        out = downloadFile(self.url, self.dir / 'obj')
+        self.assertEqual(out.name, 'srv.fits')
+        self.assertEqual(downloadFile(self.url, self.dir / 'obj'), out)
+        self.assertEqual(len(Handler.requests), 1)
+
+    def test_lookup_hash(self):
+        store = SpectrumStore(self.dir / 'store')
+        downloadFile(self.url, self.dir / 'obj', store=store)
+        calls = []
+        sha256sum = download.sha256sum
+        download.sha256sum = lambda path: calls.append(path) or sha256sum(path)
+        try:
+            self.assertIsNotNone(store.lookup(self.url))
+            self.assertEqual(len(calls), 0)
+            rec = store.lookup(self.url)
+            os.utime(store.path(rec['sha256']), ns=(0, 0))
+            self.assertIsNotNone(store.lookup(self.url))
+            self.assertEqual(len(calls), 1)
+            self.assertIsNotNone(store.lookup(self.url))
+            self.assertEqual(len(calls), 1)
+            self.assertIsNotNone(store.lookup(self.url, verify=True))
+            self.assertEqual(len(calls), 2)
+        finally:
+            download.sha256sum = sha256sum
+
+if __name__ == '__main__':
+    unittest.main()
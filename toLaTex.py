@@ -1,9 +1,7 @@
 #!/usr/bin/env python3
 
-from citing import getBibTeX
-import random
-import string
-from sed_input import read_ascii, read_cleaned, magToJy, JyToLamFlam
+from citing import getBibTeX, fetchBibTeX, BibStore, fileFetcher, mergeBib
+from sed_input import convert_sed
 import argparse
 import sys, os
 import numpy as np
@@ -21,110 +19,161 @@ epilog = \
 """
 examples:
     toLaTex.py --phot=AKSco/AKSco_phot.dat
+    toLaTex.py --phot=AKSco/AKSco_phot.dat,HD283571/HD283571_phot.dat --bib=sample.bib
+    toLaTex.py --merge=AKSco/sedbys_AKSco.bib,HD283571/sedbys_HD283571.bib --bib=sample.bib
 
 """
 
-parser = argparse.ArgumentParser(description=description,epilog=epilog,
-         formatter_class=argparse.RawDescriptionHelpFormatter)
-parser.add_argument("--phot",dest="phot",default='',type=str,
-                    help='Path from current working directory to photometry data file.')
-
-argopt = parser.parse_args()
-
-############
-# 1. Read in the photometric data:
-############
-infile = Path(argopt.phot)
-if infile.suffix == '.dat':
-    if 'cleaned' not in infile.name:
-        wvlen,wband,jy,ejy,flag,unit,beam,odate,ref = read_ascii(infile)
-    else:
-        wvlen,wband,f,ef,flag,beam,odate,ref = read_cleaned(infile)
-        jy = None
-elif infile.exists():
-    print('')
-    print('Error: this function is limited to plotting ascii files output by queryDB.py.')
-    print('')
-    sys.exit()
-else:
-    print('')
-    print('Error: file not found!')
-    sys.exit()
-
-############
-# 2. Convert photometry data to W/m^2 (lamFlam): 
-############
-if jy:
-    for i in range(0, len(jy)):
-        if ejy[i] == '--':
-            ejy[i] = np.nan
+def write_latex(photFiles, bib='', store=None, fetcher=None):
+    """
+    Function to write the photometry in each of photFiles (as
+    output by queryDB.py or inspectSED.py) to a LaTeX-ready table
+    in sedbys_<obj>.tex, with the BibTeX entries for the cited 
+    references in sedbys_<obj>.bib (both in the directory of 
+    each file). 
+    - bib is a .bib file to which the BibTeX entries for all
+      objects are written instead.
+    - store and fetcher are the citing.BibStore in which the 
+      BibTeX entries are saved and the fetcher used to retrieve
+      any missing entries (see citing.fetchBibTeX).
+    Returns the names of the .tex files written. Raises 
+    ValueError (or FileNotFoundError) if any of photFiles is
+    not a photometry file (or does not exist).
+    """
+    ############
+    # 1. Read in the photometric data for each object and convert
+    #    it to W/m^2 (lamFlam):
+    ############
+    phots = []
+    for pf in photFiles:
+        infile = Path(str(pf).strip())
+        if not infile.exists():
+            print('')
+            print('Error: file '+str(infile)+' not found!')
+            raise FileNotFoundError(str(infile))
+        elif infile.suffix == '.dat':
+            wvlen,wband,f,ef,flag,beam,odate,ref = convert_sed(infile)
         else:
-            ejy[i] = float(ejy[i])
+            print('')
+            print('Error: this function is limited to plotting ascii files output by queryDB.py.')
+            print('')
+            raise ValueError(str(infile))
+        phots.append((infile, wvlen, f, ef, odate, ref))
     
-        if unit[i] == 'mag':
-            jy[i], ejy[i] = magToJy(jy[i],ejy[i], wband[i])
-            unit[i] = 'Jy'
-        elif unit[i] == 'mJy':
-            jy[i] = jy[i]*1e-3
-            ejy[i] = ejy[i]*1e-3
-            unit[i] = 'Jy'
+    ############
+    # 2. Collect bibref and write to file:
+    ############
+    # retrieve all missing BibTeX entries for all objects at once (saved entries 
+    # are re-used):
+    if store is None:
+        store = BibStore()
+    entries = fetchBibTeX([r for p in phots for r in p[5]], store, fetcher)
     
-    f, ef = [], []
-    for i in range(0, len(wvlen)):
-        f.append(JyToLamFlam(jy[i],ejy[i],wvlen[i])[0])
-        ef.append(JyToLamFlam(jy[i],ejy[i],wvlen[i])[1])
+    outFiles = []
+    bibDict = {'bibtag' : 'authorYYYY'}
+    for infile, wvlen, f, ef, odate, ref in phots:
+        if bib != '':
+            outBib = Path(bib)
+        else:
+            outBib = infile.parent / Path('sedbys_'+infile.name.split('_')[0]+'.bib')
+        outTex = infile.parent / Path('sedbys_'+infile.name.split('_')[0]+'.tex')
+        print('Writing data to Tex file',outTex)
+        with open(outTex, 'a') as o:
+            o.write('Wavelength & $\\lambda F_{\\lambda}$   & Date & Reference\\\\\n')
+            o.write('$\\mu$m     & $10^{-13}$\,W\\,m$^{-2}$ &      &   \\\\\n')
+            o.write('\\hline \n')
 
-############
-# 3. Collect bibref and write to file:
-############
-outBib = infile.parent / Path('sedbys_'+infile.name.split('_')[0]+'.bib')
-outTex = infile.parent / Path('sedbys_'+infile.name.split('_')[0]+'.tex')
-print('Writing data to Tex file',outTex)
-with open(outTex, 'a') as o:
-    o.write('Wavelength & $\\lambda F_{\\lambda}$   & Date & Reference\\\\\n')
-    o.write('$\\mu$m     & $10^{-13}$\,W\\,m$^{-2}$ &      &   \\\\\n')
-    o.write('\\hline \n')
+        for r in sorted(set(ref)):
+            # download the bibtex entry (if not already in outBib) and edit the bibtag. 
+            # The tag suffix is generated from the bibcode to avoid any instances of same 
+            # auth+year combinations:
+            try:
+                bibDict[r] = getBibTeX(r,None,outBib,store,fetcher,entries)
+            except ValueError as ve:
+                print('Warning: '+str(ve)+'; it is cited by its bibcode')
+                bibDict[r] = r
 
-bibDict = {'bibtag' : 'authorYYYY'}
-uniqueRef = list(set(ref))
-for r in range(0, len(uniqueRef)):
-    # generate random tag_suf for each reference to avoid any instances of same auth+year
-    # combinations.
-    tag_suf = random.choice(string.ascii_lowercase)+random.choice(string.ascii_lowercase)
-    # download the bibtex entry and edit the bibtag:
-    bibtag = getBibTeX(uniqueRef[r],tag_suf,outBib)
-    bibDict[uniqueRef[r]] = bibtag
+        inds = np.array(wvlen).argsort()
+        sort_wv = np.array(wvlen)[inds]
+        sort_f  = np.array(f)[inds]
+        sort_ef = np.array(ef)[inds]
+        sort_d  = np.array(odate)[inds]
+        sort_ref = np.array(ref)[inds]
 
-inds = np.array(wvlen).argsort()
-sort_wv = np.array(wvlen)[inds]
-sort_f  = np.array(f)[inds]
-sort_ef = np.array(ef)[inds]
-sort_d  = np.array(odate)[inds]
-sort_ref = np.array(ref)[inds]
+        for r in range(0, len(sort_ref)):
+            # output a table of wavelength, flux, reference to file:
+            with open(outTex, 'a') as o:
+                wv = '{:.2f}'.format(sort_wv[r]*1e6)
+                fr = '{:.3e}'.format(sort_f[r])
+                if np.isnan(float(sort_ef[r])):
+                    f_exp = '{:.3e}'.format(float(sort_f[r])).split('e')[1]
+                    d = max(int(abs(-13-int(f_exp)))+1, 4)
+                    f_fmt = '{:0='+str(d)+'.'+str(d-1)+'f}e-13'
+                    ffr = f_fmt.format(float(sort_f[r])*1e13)
+                    o.write(wv+' & $'+ffr.split('e')[0]+'$ & '+sort_d[r]+' & \\citet{'+bibDict[sort_ref[r]]+'} \\\\ \n')
+                else:
+                    # Get flux measurement and its error to same power of ten:
+                    ef_exp = '{:.3e}'.format(float(sort_ef[r])).split('e')[1]
+                    d = max(int(abs(-13-int(ef_exp)))+1, 4)
+                    ef_fmt = '{:0='+str(d)+'.'+str(d-1)+'f}e-13'
+                    efr = ef_fmt.format(float(sort_ef[r])*1e13)
+                    ffr = ef_fmt.format(float(sort_f[r])*1e13)
+                    if efr == ffr:
+                        # Catch instances where the value is an upper limit on the flux density.
+                        o.write(wv+' & $<'+ffr.split('e')[0]+'$ & '+sort_d[r]+' & \\citet{'+bibDict[sort_ref[r]]+'} \\\\ \n')
+                    else:
+                        o.write(wv+' & $'+ffr.split('e')[0]+'\\pm'+efr.split('e')[0]+'$ & '+sort_d[r]+' & \\citet{'+bibDict[sort_ref[r]]+'} \\\\ \n')
 
-for r in range(0, len(sort_ref)):
-    # output a table of wavelength, flux, reference to file:
-    with open(outTex, 'a') as o:
-        wv = '{:.2f}'.format(sort_wv[r]*1e6)
-        fr = '{:.3e}'.format(sort_f[r])
-        if np.isnan(float(sort_ef[r])):
-            f_exp = '{:.3e}'.format(float(sort_f[r])).split('e')[1]
-            d = max(int(abs(-13-int(f_exp)))+1, 4)
-            f_fmt = '{:0='+str(d)+'.'+str(d-1)+'f}e-13'
-            ffr = f_fmt.format(float(sort_f[r])*1e13)
-            o.write(wv+' & $'+ffr.split('e')[0]+'$ & '+sort_d[r]+' & \\citet{'+bibDict[sort_ref[r]]+'} \\\\ \n')
-        else:
-            # Get flux measurement and its error to same power of ten:
-            ef_exp = '{:.3e}'.format(float(sort_ef[r])).split('e')[1]
-            d = max(int(abs(-13-int(ef_exp)))+1, 4)
-            ef_fmt = '{:0='+str(d)+'.'+str(d-1)+'f}e-13'
-            efr = ef_fmt.format(float(sort_ef[r])*1e13)
-            ffr = ef_fmt.format(float(sort_f[r])*1e13)
-            if efr == ffr:
-                # Catch instances where the value is an upper limit on the flux density.
-                o.write(wv+' & $<'+ffr.split('e')[0]+'$ & '+sort_d[r]+' & \\citet{'+bibDict[sort_ref[r]]+'} \\\\ \n')
-            else:
-                o.write(wv+' & $'+ffr.split('e')[0]+'\\pm'+efr.split('e')[0]+'$ & '+sort_d[r]+' & \\citet{'+bibDict[sort_ref[r]]+'} \\\\ \n')
+        with open(outTex, 'a') as o:
+            o.write('\\hline \n\n\n')
+        outFiles.append(outTex)
+
+    return outFiles
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=description,epilog=epilog,
+             formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--phot",dest="phot",default='',type=str,
+                        help='Path from current working directory to photometry data file (or a comma-separated list of files).')
+    parser.add_argument("--bib",dest="bib",default='',type=str,
+                        help='Write the BibTeX entries for all objects to this one .bib file')
+    parser.add_argument("--cache-dir",dest="cacheDir",default='',type=str,
+                        help='Directory for the BibTeX cache (default ~/.cache/sedbys)')
+    parser.add_argument("--no-cache",dest="noCache",action='store_true',
+                        help='Do not read or save cached BibTeX entries')
+    parser.add_argument("--bibsrc",dest="bibsrc",default='',type=str,
+                        help='Local .bib file of ADS exports to use instead of NASA ADS')
+    parser.add_argument("--merge",dest="merge",default='',type=str,
+                        help='Comma-separated list of .bib files to merge (without duplicates) into the file given by --bib')
+
+    argopt = parser.parse_args()
+
+    if argopt.noCache:
+        store = BibStore(':memory:')
+    elif argopt.cacheDir != '':
+        store = BibStore(Path(argopt.cacheDir) / 'bibtex.sqlite')
+    else:
+        store = BibStore()
+    fetcher = fileFetcher(argopt.bibsrc) if argopt.bibsrc != '' else None
+
+    if argopt.merge != '':
+        if argopt.bib == '':
+            print('Error: --merge requires the output .bib file to be given with --bib')
+            sys.exit()
+        for bibFile in argopt.merge.split(','):
+            if not Path(bibFile).exists():
+                print('Error: '+bibFile+' not found')
+                sys.exit()
+        if argopt.phot == '':
+            n = mergeBib(argopt.merge.split(','), argopt.bib)
+            print(str(n)+' entries merged into '+argopt.bib)
+            sys.exit()
+
+    try:
+        write_latex(argopt.phot.split(','), argopt.bib, store, fetcher)
+    except (ValueError, FileNotFoundError):
+        sys.exit()
 
-with open(outTex, 'a') as o:
-    o.write('\\hline \n\n\n')
+    if argopt.merge != '':
+        n = mergeBib(argopt.merge.split(','), argopt.bib)
+        print(str(n)+' entries merged into '+argopt.bib)